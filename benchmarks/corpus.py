@@ -0,0 +1,81 @@
+"""
+Deterministic synthetic Markdown corpora for the benchmarks.
+"""
+
+import random
+
+WORDS = (
+    'agent data pipeline clickhouse query latency shard replica schema deploy '
+    'cluster metric report token market price stream cache index build page '
+    'infrastructure kubernetes region analytics realtime storage compression'
+).split()
+
+# Relative weight of each block kind per corpus profile
+PROFILES = {
+    'mixed': {'paragraph': 5, 'list': 2, 'ordered': 1, 'nested': 1, 'code': 1, 'table': 1, 'heading': 1},
+    'lists': {'paragraph': 1, 'list': 4, 'ordered': 3, 'nested': 3, 'code': 0, 'table': 0, 'heading': 1},
+    'code': {'paragraph': 1, 'list': 1, 'ordered': 0, 'nested': 0, 'code': 6, 'table': 1, 'heading': 1},
+}
+
+def _sentence(rng, words=12):
+    parts = [rng.choice(WORDS) for _ in range(words)]
+    i = rng.randrange(words)
+    roll = rng.random()
+    if roll < 0.2:
+        parts[i] = f'**{parts[i]}**'
+    elif roll < 0.35:
+        parts[i] = f'*{parts[i]}*'
+    elif roll < 0.5:
+        parts[i] = f'`{parts[i]}()`'
+    elif roll < 0.6:
+        parts[i] = f'[{parts[i]}](https://example.com/{parts[i]})'
+    return ' '.join(parts).capitalize() + '.'
+
+def _block(rng, kind):
+    if kind == 'heading':
+        return f"{'#' * rng.randint(1, 3)} {_sentence(rng, 4)[:-1]}"
+    if kind == 'paragraph':
+        return ' '.join(_sentence(rng) for _ in range(rng.randint(1, 4)))
+    if kind == 'list':
+        return '\n'.join(f'- {_sentence(rng, 8)}' for _ in range(rng.randint(3, 8)))
+    if kind == 'ordered':
+        return '\n'.join(f'{i}. {_sentence(rng, 8)}' for i in range(1, rng.randint(3, 15)))
+    if kind == 'nested':
+        lines = []
+        for _ in range(rng.randint(2, 5)):
+            lines.append(f'- {_sentence(rng, 6)}')
+            for depth in range(1, rng.randint(1, 3) + 1):
+                lines.append(f"{'  ' * depth}- {_sentence(rng, 6)}")
+        return '\n'.join(lines)
+    if kind == 'code':
+        body = '\n'.join(f"    {rng.choice(WORDS)} = <{rng.choice(WORDS)}> & {rng.randint(0, 999)}"
+                         for _ in range(rng.randint(4, 20)))
+        return f'```python\n{body}\n```'
+    rows = [f'| {rng.choice(WORDS)} | {rng.randint(0, 999)} | {_sentence(rng, 3)} |'
+            for _ in range(rng.randint(3, 10))]
+    return '| Name | Value | Notes |\n|------|------:|-------|\n' + '\n'.join(rows)
+
+def make_document(size, profile='mixed', seed=0):
+    """Return a Markdown document of about `size` characters."""
+    rng = random.Random(f'{profile}:{size}:{seed}')
+    kinds, weights = zip(*PROFILES[profile].items())
+    blocks = ['---\ntitle: Synthetic benchmark document\n---\n']
+    length = len(blocks[0])
+    while length < size:
+        block = _block(rng, rng.choices(kinds, weights)[0])
+        blocks.append(block)
+        length += len(block) + 2
+    return '\n\n'.join(blocks) + '\n'
+
+def parse_size(text):
+    """Parse sizes like '1K', '10M' or '512' into a character count."""
+    text = text.strip().upper()
+    scale = {'K': 1024, 'M': 1024 * 1024}.get(text[-1:], 1)
+    return int(float(text.rstrip('KM')) * scale)
+
+def format_size(size):
+    if size >= 1024 * 1024:
+        return f'{size / 1024 / 1024:g}M'
+    if size >= 1024:
+        return f'{size / 1024:g}K'
+    return str(size)
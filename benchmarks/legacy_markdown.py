@@ -0,0 +1,89 @@
+"""
+Reference copy of the original build.py parse_markdown, kept for benchmarks.
+"""
+
+import re
+
+def parse_markdown(content):
+    """Parse markdown and convert to HTML (pre-engine line state machine)."""
+    lines = content.split('\n')
+    output = []
+    in_list = False
+    in_code_block = False
+    list_type = None
+
+    for line in lines:
+        # Code block
+        if line.strip().startswith('```'):
+            if not in_code_block:
+                output.append('<pre><code>')
+                in_code_block = True
+            else:
+                output.append('</code></pre>')
+                in_code_block = False
+            continue
+
+        if in_code_block:
+            output.append(line)
+            continue
+
+        # List items
+        if line.strip().startswith('- ') or line.strip().startswith('* '):
+            if not in_list:
+                output.append('<ul>')
+                in_list = True
+                list_type = 'ul'
+            output.append(f'<li>{line.strip()[2:]}</li>')
+        elif line.strip().startswith(tuple([f'{i}. ' for i in range(1, 10)])):
+            if not in_list or list_type != 'ol':
+                if in_list and list_type == 'ul':
+                    output.append('</ul>')
+                output.append('<ol>')
+                in_list = True
+                list_type = 'ol'
+            # Find the number and text
+            match = re.match(r'^(\d+)\.\s+(.+)$', line.strip())
+            if match:
+                output.append(f'<li>{match.group(2)}</li>')
+        elif line.strip() == '':
+            if in_list:
+                output.append('</ul>' if list_type == 'ul' else '</ol>')
+                in_list = False
+                list_type = None
+            output.append('')
+        elif line.strip().startswith('### '):
+            if in_list:
+                output.append('</ul>' if list_type == 'ul' else '</ol>')
+                in_list = False
+            output.append(f'<h3>{line.strip()[4:]}</h3>')
+        elif line.strip().startswith('## '):
+            if in_list:
+                output.append('</ul>' if list_type == 'ul' else '</ol>')
+                in_list = False
+            output.append(f'<h2>{line.strip()[3:]}</h2>')
+        elif line.strip().startswith('# '):
+            if in_list:
+                output.append('</ul>' if list_type == 'ul' else '</ol>')
+                in_list = False
+            output.append(f'<h1>{line.strip()[2:]}</h1>')
+        else:
+            if in_list:
+                output.append('</ul>' if list_type == 'ul' else '</ol>')
+                in_list = False
+            if line.strip():
+                # Bold
+                line = re.sub(r'\*\*(.*?)\*\*', r'<strong>\1</strong>', line)
+                # Italic
+                line = re.sub(r'\*(.*?)\*', r'<em>\1</em>', line)
+                # Links
+                line = re.sub(r'\[(.*?)\]\((.*?)\)', r'<a href="\2">\1</a>', line)
+                # Inline code
+                line = re.sub(r'`(.*?)`', r'<code>\1</code>', line)
+                output.append(f'<p>{line}</p>')
+            else:
+                output.append('')
+
+    if in_list:
+        output.append('</ul>' if list_type == 'ul' else '</ol>')
+
+    return '\n'.join(output)
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the Markdown and templating hot paths.
+
+Usage:
+  python3 benchmarks/run.py                   # run and print timings
+  python3 benchmarks/run.py --save            # also store them as the baseline
+  python3 benchmarks/run.py --compare         # exit 1 on regressions vs. the baseline
+  python3 benchmarks/run.py --sizes 1K,10M --posts 5000 --corpus lists --jobs 0
+
+Documents are synthetic (benchmarks/corpus.py) and deterministic, so runs
+on the same machine are comparable. Baselines are machine-specific.
+parse_markdown is also timed against the original line state machine
+(benchmarks/legacy_markdown.py) and the speedup reported.
+"""
+
+import argparse
+import contextlib
+import gc
+import io
+import json
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / 'benchmarks'))
+
+import build
+import legacy_markdown
+from corpus import PROFILES, format_size, make_document, parse_size
+from sitegen import render_markdown
+
+DEFAULT_BASELINE = ROOT / 'benchmarks' / 'baseline.json'
+
+def best_time(func, repeat, setup=None, min_sample=0.05):
+    """Return the best per-call time of func() over `repeat` samples, in seconds.
+
+    Fast calls are looped so each sample lasts at least min_sample seconds,
+    with the garbage collector paused as timeit does; setup() runs before
+    every call (keep it cheap, e.g. a cache clear).
+    """
+    def sample(number):
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            for _ in range(number):
+                if setup:
+                    setup()
+                func()
+            return (time.perf_counter() - start) / number
+        finally:
+            gc.enable()
+
+    first = sample(1)
+    number = max(1, int(min_sample / first)) if first > 0 else 1000
+    return min([first] + [sample(number) for _ in range(repeat)])
+
+def quiet(func, *args, **kwargs):
+    """Call func with its progress output suppressed."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return func(*args, **kwargs)
+
+def bench_documents(results, blog, tmp, sizes, corpus, repeat):
+    """Single-document hot paths at each size."""
+    for size in sizes:
+        label = format_size(size)
+        text = make_document(size, corpus)
+        body = build.parse_markdown(text)
+        path = tmp / f'doc-{label}.md'
+        path.write_text(text)
+
+        results[f'parse_markdown/{label}'] = best_time(
+            lambda: build.parse_markdown(text), repeat)
+        results[f'legacy_parse_markdown/{label}'] = best_time(
+            lambda: legacy_markdown.parse_markdown(text), repeat)
+        results[f'markdown_to_html/{label}'] = best_time(
+            lambda: blog.markdown_to_html(text), repeat, setup=render_markdown.cache_clear)
+        results[f'read_markdown_file/{label}'] = best_time(
+            lambda: build.read_markdown_file(path), repeat)
+        results[f'generate_page_html/{label}'] = best_time(
+            lambda: build.generate_page_html('Benchmark', body, 'about'), repeat)
+
+def bench_site(results, tmp, page_size, corpus, repeat, jobs):
+    """Full and no-op incremental generate_site() over synthetic pages."""
+    site = tmp / 'site'
+    (site / 'content').mkdir(parents=True)
+    for asset_name in ('oat.min.css', 'oat.min.js', 'index.html'):
+        shutil.copy(ROOT / asset_name, site / asset_name)
+    for seed, md_file in enumerate(build.PAGES):
+        (site / 'content' / md_file).write_text(make_document(page_size, corpus, seed))
+
+    label = format_size(page_size)
+    results[f'generate_site/full-{label}'] = best_time(
+        lambda: quiet(build.generate_site, jobs=jobs, root=site),
+        repeat, setup=render_markdown.cache_clear)
+    results[f'generate_site/incremental-noop-{label}'] = best_time(
+        lambda: quiet(build.generate_site, incremental=True, jobs=jobs, root=site), repeat)
+
+def bench_blog(results, blog, tmp, posts, post_size, corpus, repeat, jobs):
+    """publish_blog_posts() over a directory of synthetic dated posts."""
+    content_dir = tmp / 'blog' / 'content'
+    content_dir.mkdir(parents=True)
+    for i in range(posts):
+        name = f'2026-{i // 28 % 12 + 1:02d}-{i % 28 + 1:02d}-post-{i}.md'
+        (content_dir / name).write_text(f'# Post {i}\n\n' + make_document(post_size, corpus, i))
+    blog.CONTENT_DIR = content_dir
+    blog.OUTPUT_DIR = tmp / 'blog' / 'docs'
+
+    results[f'publish_blog_posts/{posts}x{format_size(post_size)}'] = best_time(
+        lambda: quiet(blog.publish_blog_posts, jobs=jobs),
+        repeat, setup=render_markdown.cache_clear)
+
+def compare(results, baseline, threshold, min_delta=0.0001):
+    """Print results against a baseline; return the names that regressed.
+
+    A benchmark regresses when it is more than `threshold` slower and the
+    slowdown exceeds min_delta seconds (timer noise on tiny workloads).
+    """
+    regressed = []
+    print(f"\n{'benchmark':<40} {'baseline':>12} {'now':>12} {'change':>9}")
+    for name, seconds in results.items():
+        base = baseline.get(name)
+        if base is None:
+            print(f"{name:<40} {'-':>12} {seconds * 1000:>10.2f}ms {'new':>9}")
+            continue
+        change = seconds / base - 1
+        flag = ''
+        if change > threshold and seconds - base > min_delta:
+            regressed.append(name)
+            flag = '  ❌'
+        print(f"{name:<40} {base * 1000:>10.2f}ms {seconds * 1000:>10.2f}ms {change:>+8.1%}{flag}")
+    return regressed
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the Markdown and templating hot paths.')
+    parser.add_argument('--sizes', default='1K,100K,1M,10M',
+                        help='document sizes (default: 1K,100K,1M,10M)')
+    parser.add_argument('--corpus', choices=sorted(PROFILES), default='mixed',
+                        help='synthetic corpus profile (default: mixed)')
+    parser.add_argument('--page-size', default='100K', help='size of each generate_site page (default: 100K)')
+    parser.add_argument('--posts', type=int, default=1000, help='number of blog posts (default: 1000)')
+    parser.add_argument('--post-size', default='4K', help='size of each blog post (default: 4K)')
+    parser.add_argument('--jobs', type=int, default=1, help='--jobs for the site and blog runs (default: 1)')
+    parser.add_argument('--repeat', type=int, default=3, help='runs per measurement, best is kept (default: 3)')
+    parser.add_argument('--baseline', type=Path, default=DEFAULT_BASELINE,
+                        help=f'baseline file (default: {DEFAULT_BASELINE.relative_to(ROOT)})')
+    parser.add_argument('--save', action='store_true', help='save these results as the baseline')
+    parser.add_argument('--compare', action='store_true', help='compare with the baseline, exit 1 on regressions')
+    parser.add_argument('--threshold', type=float, default=0.15,
+                        help='slowdown counted as a regression (default: 0.15 = 15%%)')
+    args = parser.parse_args(argv)
+
+    blog = build.load_blog_publisher()
+    sizes = [parse_size(s) for s in args.sizes.split(',')]
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        bench_documents(results, blog, tmp, sizes, args.corpus, args.repeat)
+        bench_site(results, tmp, parse_size(args.page_size), args.corpus, args.repeat, args.jobs)
+        bench_blog(results, blog, tmp, args.posts, parse_size(args.post_size), args.corpus,
+                   args.repeat, args.jobs)
+
+    print(f"{'benchmark':<40} {'best':>12}")
+    for name, seconds in results.items():
+        print(f"{name:<40} {seconds * 1000:>10.2f}ms")
+
+    print(f"\n{'size':>8}  {'legacy':>10}  {'engine':>10}  {'speedup':>8}")
+    for size in sizes:
+        label = format_size(size)
+        legacy = results[f'legacy_parse_markdown/{label}']
+        engine = results[f'parse_markdown/{label}']
+        print(f"{label:>8}  {legacy * 1000:>8.2f}ms  {engine * 1000:>8.2f}ms  {legacy / engine:>7.1f}x")
+
+    status = 0
+    if args.compare:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline.get('corpus') != args.corpus:
+            print(f"⚠️  Baseline used corpus '{baseline.get('corpus')}', this run used '{args.corpus}'")
+        regressed = compare(results, baseline['results'], args.threshold)
+        if regressed:
+            print(f"\n❌ {len(regressed)} regression(s) over {args.threshold:.0%}: {', '.join(regressed)}")
+            status = 1
+        else:
+            print(f"\n✅ No regressions over {args.threshold:.0%}")
+
+    if args.save:
+        with open(args.baseline, 'w') as f:
+            json.dump({
+                'corpus': args.corpus,
+                'python': platform.python_version(),
+                'machine': platform.machine(),
+                'results': results,
+            }, f, indent=2)
+        print(f"\n💾 Baseline saved to {args.baseline}")
+    return status
+
+if __name__ == '__main__':
+    sys.exit(main())
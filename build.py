@@ -4,11 +4,43 @@ Modern static site builder for Duet Company website.
 Uses sophisticated neutral palette with emerald accent.
 """
 
+import argparse
+import importlib.util
+import json
 import os
-import re
 import shutil
+import sys
+from functools import lru_cache
 from pathlib import Path
 
+from sitegen import iter_markdown, parse_front_matter, parse_markdown, render_document, split_front_matter
+from sitegen.assets import (asset_name, fingerprinted_name, minify_css, rewrite_asset_urls,
+                            write_fingerprinted, write_if_changed)
+from sitegen.compress import compress_tree, format_size_table
+from sitegen.critical import critical_css
+from sitegen.images import Image, optimize_images
+from sitegen.links import check_links, format_problems
+from sitegen.manifest import hash_bytes, hash_file, hash_sources, is_fresh, load_manifest, save_manifest
+from sitegen.minify import HtmlMinifier, Sprite, format_savings, minify_html
+from sitegen.parallel import map_files
+from sitegen.profiling import PROFILER, span
+from sitegen.search import WIDGET_NAME, build_search_index
+from sitegen.serve import serve
+from sitegen.stream import read_lines
+
+# Incremental build manifest, persisted next to the generated output
+MANIFEST_NAME = '.build-manifest.json'
+MANIFEST_VERSION = 1
+
+# Logical asset name -> fingerprinted file name, published as JSON in docs/
+ASSET_MANIFEST_NAME = 'asset-manifest.json'
+
+# How long external link results stay cached in docs/.link-cache.json
+LINK_CACHE_TTL = 24 * 3600
+
+# Sources at least this large are rendered line by line straight to disk
+STREAM_THRESHOLD = 1024 * 1024
+
 # CSS template with new design system
 CSS_TEMPLATE = """/* Modern CSS 2025 - Sophisticated Neutral Palette */
 :root {
@@ -501,110 +533,78 @@ footer {
 }
 """
 
-def parse_markdown(content):
-    """Parse markdown and convert to HTML."""
-    lines = content.split('\n')
-    output = []
-    in_list = False
-    in_code_block = False
-    list_type = None
-
-    for line in lines:
-        # Code block
-        if line.strip().startswith('```'):
-            if not in_code_block:
-                output.append('<pre><code>')
-                in_code_block = True
-            else:
-                output.append('</code></pre>')
-                in_code_block = False
-            continue
-
-        if in_code_block:
-            output.append(line)
-            continue
-
-        # List items
-        if line.strip().startswith('- ') or line.strip().startswith('* '):
-            if not in_list:
-                output.append('<ul>')
-                in_list = True
-                list_type = 'ul'
-            output.append(f'<li>{line.strip()[2:]}</li>')
-        elif line.strip().startswith(tuple([f'{i}. ' for i in range(1, 10)])):
-            if not in_list or list_type != 'ol':
-                if in_list and list_type == 'ul':
-                    output.append('</ul>')
-                output.append('<ol>')
-                in_list = True
-                list_type = 'ol'
-            # Find the number and text
-            match = re.match(r'^(\d+)\.\s+(.+)$', line.strip())
-            if match:
-                output.append(f'<li>{match.group(2)}</li>')
-        elif line.strip() == '':
-            if in_list:
-                output.append('</ul>' if list_type == 'ul' else '</ol>')
-                in_list = False
-                list_type = None
-            output.append('')
-        elif line.strip().startswith('### '):
-            if in_list:
-                output.append('</ul>' if list_type == 'ul' else '</ol>')
-                in_list = False
-            output.append(f'<h3>{line.strip()[4:]}</h3>')
-        elif line.strip().startswith('## '):
-            if in_list:
-                output.append('</ul>' if list_type == 'ul' else '</ol>')
-                in_list = False
-            output.append(f'<h2>{line.strip()[3:]}</h2>')
-        elif line.strip().startswith('# '):
-            if in_list:
-                output.append('</ul>' if list_type == 'ul' else '</ol>')
-                in_list = False
-            output.append(f'<h1>{line.strip()[2:]}</h1>')
-        else:
-            if in_list:
-                output.append('</ul>' if list_type == 'ul' else '</ol>')
-                in_list = False
-            if line.strip():
-                # Bold
-                line = re.sub(r'\*\*(.*?)\*\*', r'<strong>\1</strong>', line)
-                # Italic
-                line = re.sub(r'\*(.*?)\*', r'<em>\1</em>', line)
-                # Links
-                line = re.sub(r'\[(.*?)\]\((.*?)\)', r'<a href="\2">\1</a>', line)
-                # Inline code
-                line = re.sub(r'`(.*?)`', r'<code>\1</code>', line)
-                output.append(f'<p>{line}</p>')
-            else:
-                output.append('')
-
-    if in_list:
-        output.append('</ul>' if list_type == 'ul' else '</ol>')
-
-    return '\n'.join(output)
-
 def read_markdown_file(path):
     """Read a markdown file and extract metadata."""
-    with open(path, 'r') as f:
-        content = f.read()
-
-    metadata = {}
-    if content.startswith('---'):
-        parts = content.split('---', 2)
-        if len(parts) >= 3:
-            metadata_str = parts[1]
-            content = parts[2]
-            for line in metadata_str.split('\n'):
-                if ':' in line:
-                    key, value = line.split(':', 1)
-                    metadata[key.strip()] = value.strip()
-
-    return metadata, content
-
-def generate_page_html(title, html_content, active_nav=''):
-    """Generate HTML page with template."""
+    with span('read'):
+        with open(path, 'r') as f:
+            content = f.read()
+
+    with span('front_matter'):
+        return parse_front_matter(content)
+
+# Page definitions: source file -> (default title, active nav, output file)
+PAGES = {
+    'about.md': ('About Duet Company', 'about', 'about.html'),
+    'features.md': ('Features - AI Data Labs', 'features', 'features.html'),
+    'pricing.md': ('Pricing - AI Data Labs', 'pricing', 'pricing.html'),
+    'contact.md': ('Contact - AI Data Labs', 'contact', 'contact.html'),
+}
+
+# CSS_TEMPLATE ships as one minified, content-fingerprinted stylesheet
+# (docs/site.<hash>.css) linked from every page instead of being inlined.
+SITE_CSS = minify_css(CSS_TEMPLATE)
+SITE_CSS_NAME = fingerprinted_name('site', '.css', SITE_CSS)
+
+# Static assets copied into docs/ under content-fingerprinted names, so
+# clients can cache them as immutable. Plain-named copies are kept for
+# hand-written pages that still link /oat.min.css.
+STATIC_ASSETS = ('oat.min.css', 'oat.min.js')
+
+def site_dir(root=None):
+    """The site directory: root, or the directory of build.py."""
+    return Path(root) if root else Path(__file__).parent
+
+@lru_cache(maxsize=None)
+def static_asset_names(root=None):
+    """Fingerprinted names of the STATIC_ASSETS present in the site directory."""
+    website_dir = site_dir(root)
+    return {name: asset_name(website_dir / name) for name in STATIC_ASSETS
+            if (website_dir / name).exists()}
+
+FONTS_URL = ('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600'
+             '&family=Clash+Display:wght@500;600;700&display=swap')
+
+# Blog feed written by scripts/publish-blog.py, linked from pages once it exists
+FEED_PATH = 'blog/feed.xml'
+FEED_LINK = f'\n    <link rel="alternate" type="application/atom+xml" title="Duet Company Blog" href="/{FEED_PATH}">'
+
+# Typical start of a content page body, above the fold with the page header
+FOLD_SAMPLE = '<h2></h2><p><a href="#"></a><strong></strong><em></em><code></code></p><ul><li></li></ul>'
+
+def stylesheet_links(critical=False, root=None):
+    """Stylesheet markup for the page <head> of the site in root.
+
+    With critical=True the template's critical CSS is inlined and the font
+    and full stylesheets are preloaded and applied once they arrive, so
+    they no longer block first paint (<noscript> links them as usual).
+    """
+    oat_name = static_asset_names(root).get('oat.min.css')
+    sheets = ([f'/{oat_name}'] if oat_name else []) + [f'/{SITE_CSS_NAME}']
+    if not critical:
+        return '\n    '.join([f'<link href="{FONTS_URL}" rel="stylesheet">']
+                             + [f'<link rel="stylesheet" href="{href}">' for href in sheets])
+    sheets.insert(0, FONTS_URL)
+    preloads = [f'<link rel="preload" href="{href}" as="style" '
+                f'onload="this.onload=null;this.rel=\'stylesheet\'">' for href in sheets]
+    fallback = ''.join(f'<link rel="stylesheet" href="{href}">' for href in sheets)
+    return '\n    '.join([f'<style>{critical_stylesheet(root)}</style>'] + preloads
+                         + [f'<noscript>{fallback}</noscript>'])
+
+def generate_page_html(title, html_content, active_nav='', critical=False, feed=False, root=None):
+    """Generate HTML page with template (feed=True links the blog feed).
+
+    root is the site directory whose oat.min.css the page links.
+    """
     return f"""<!DOCTYPE html>
 <html lang="en" data-theme="dark">
 <head>
@@ -613,11 +613,8 @@ def generate_page_html(title, html_content, active_nav=''):
     <title>{title}</title>
     <link rel="preconnect" href="https://fonts.googleapis.com">
     <link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>
-    <link href="https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600&family=Clash+Display:wght@500;600;700&display=swap" rel="stylesheet">
-    <link rel="stylesheet" href="/oat.min.css">
-    <style>
-{CSS_TEMPLATE}
-    </style>
+    {stylesheet_links(critical, root)}{FEED_LINK if feed else ''}
+    <script src="/{WIDGET_NAME}" defer></script>
 </head>
 <body>
     <header>
@@ -663,75 +660,413 @@ def generate_page_html(title, html_content, active_nav=''):
 </body>
 </html>"""
 
-def generate_site():
-    """Generate the static site."""
-    website_dir = Path(__file__).parent
+# Inline SVG icons of the page shell, served from one sprite when minifying
+SITE_SPRITE = Sprite([generate_page_html('\0title', '\0content', '\0nav')])
+
+def asset_names(root=None):
+    """Logical asset name -> fingerprinted file name for the site in root."""
+    names = dict(static_asset_names(root))
+    names.update({'site.css': SITE_CSS_NAME, 'search.js': WIDGET_NAME, 'sprite.svg': SITE_SPRITE.name})
+    return names
+
+def template_hash(root=None):
+    """Hash the inputs shared by every generated page of the site in root.
+
+    Covers CSS_TEMPLATE, the generate_page_html shell (with its asset
+    names) and the builder and sitegen sources, so a parser or template
+    change invalidates every page.
+    """
+    shell = generate_page_html('\0title', '\0content', '\0nav', root=root)
+    builder = hash_sources([Path(__file__)] + sorted((Path(__file__).parent / 'sitegen').glob('*.py')))
+    return hash_bytes((CSS_TEMPLATE + '\0' + shell + '\0' + builder).encode('utf-8'))
+
+def site_page_template(body, title, page_header, active_nav, critical=False, feed=False, root=None):
+    """Page template for content pages: header block plus rendered body."""
+    return generate_page_html(title, page_header + body, active_nav, critical, feed, root)
+
+def render_page(md_path, md_file, page_title, active_nav, critical=False, feed=False, root=None):
+    """Render one content page to a complete HTML document."""
+    with span(md_file, 'file'):
+        return _render_page(md_path, md_file, page_title, active_nav, critical, feed, root)
+
+def _render_page(md_path, md_file, page_title, active_nav, critical=False, feed=False, root=None):
+    metadata, content = read_markdown_file(md_path)
+    title = metadata.get('title', page_title)
+    return render_document(content, site_page_template, title=title,
+                           page_header=page_header_html(md_file, title), active_nav=active_nav,
+                           critical=critical, feed=feed, root=root)
+
+def page_header_html(md_file, title):
+    """Header block shown above a content page's body."""
+    # Wrap content in page header
+    page_header = f'<div class="page-header">\n'
+    page_header += f'    <div class="page-label">{md_file.replace(".md", "").title()}</div>\n'
+    page_header += f'    <h1 class="page-title">{title.replace(" - AI Data Labs", "")}</h1>\n'
+    page_header += f'</div>\n'
+
+    # For pricing page, add subtitle
+    if md_file == 'pricing.md':
+        page_header = f'<div class="page-header">\n'
+        page_header += f'    <div class="page-label">Pricing</div>\n'
+        page_header += f'    <h1 class="page-title">Simple, transparent pricing</h1>\n'
+        page_header += f'    <p class="page-subtitle">Choose the plan that fits your needs. All plans include a 14-day free trial.</p>\n'
+        page_header += f'</div>\n'
+
+    return page_header
+
+@lru_cache(maxsize=None)
+def critical_stylesheet(root=None):
+    """Critical CSS of the content page template, oat rules before site rules."""
+    with span('critical_css'):
+        fold = generate_page_html('', page_header_html('pricing.md', '') + FOLD_SAMPLE, root=root)
+        oat_path = site_dir(root) / 'oat.min.css'
+        oat_css = oat_path.read_text() if oat_path.exists() else ''
+        return critical_css(oat_css, fold) + critical_css(SITE_CSS, fold)
+
+def stream_page(md_path, md_file, page_title, active_nav, output_file, minifier=None,
+                critical=False, feed=False, root=None):
+    """Render a content page line by line straight into output_file.
+
+    Produces the same bytes as render_page() (minified through minifier,
+    an HtmlMinifier, when given), but only a bounded window of the source
+    and its HTML is held in memory, however large the page. Returns the
+    unminified size in bytes.
+    """
+    raw_size = 0
+
+    def write(text):
+        nonlocal raw_size
+        if minifier is not None:
+            raw_size += len(text.encode('utf-8'))
+            text = minifier.feed(text)
+        output_file.write(text)
+
+    with span(md_file, 'file'):
+        with open(md_path, 'r') as src:
+            with span('front_matter'):
+                metadata, lines = split_front_matter(read_lines(src))
+            title = metadata.get('title', page_title)
+            head, tail = generate_page_html(title, '\0body', active_nav, critical, feed, root).split('\0body')
+            with span('stream', file=output_file.name):
+                write(head)
+                write(page_header_html(md_file, title))
+                for chunk in iter_markdown(lines):
+                    write(chunk)
+                write(tail)
+                if minifier is not None:
+                    output_file.write(minifier.close())
+    return raw_size
+
+def write_page(md_path, md_file, page_title, active_nav, output_path, stream=False, minify=False,
+               critical=False, feed=False, root=None):
+    """Render one content page to output_path, streaming when asked.
+
+    The page is written to a temporary file and moved into place, so a
+    failed render never leaves a truncated page behind. With minify=True
+    returns the (unminified, written) sizes in bytes. critical=True inlines
+    the critical CSS and loads the stylesheets asynchronously; feed=True
+    links the blog feed. root is the site directory (default: next to
+    build.py).
+    """
+    tmp_path = output_path.with_name(output_path.name + '.tmp')
+    try:
+        if stream:
+            with open(tmp_path, 'w') as f:
+                minifier = HtmlMinifier(SITE_SPRITE) if minify else None
+                raw_size = stream_page(md_path, md_file, page_title, active_nav, f, minifier,
+                                           critical, feed, root)
+        else:
+            page_html = render_page(md_path, md_file, page_title, active_nav, critical, feed, root)
+            if minify:
+                raw_size = len(page_html.encode('utf-8'))
+                with span('minify', file=output_path.name):
+                    page_html = minify_html(page_html, SITE_SPRITE)
+            with span('write', file=output_path.name):
+                with open(tmp_path, 'w') as f:
+                    f.write(page_html)
+        os.replace(tmp_path, output_path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+    if minify:
+        return raw_size, output_path.stat().st_size
+    return None
+
+def generate_site(incremental=False, jobs=1, compress=False, root=None,
+                  stream_threshold=STREAM_THRESHOLD, search=True, links=None, minify=False,
+                  images=True, critical=False):
+    """Generate the static site.
+
+    With incremental=True, outputs whose inputs (source, templates, assets)
+    match the manifest in docs/ are left untouched. jobs > 1 renders pages
+    across a process pool (0 uses every core). compress=True writes .gz/.br
+    siblings for every HTML, CSS and JS file in docs/ and prints their
+    sizes. root overrides the site directory (default: next to build.py).
+    Sources of stream_threshold bytes or more are streamed to disk (0
+    streams every page). search=True refreshes the client-side search
+    index over every page in docs/, re-tokenizing only changed pages.
+    links='internal' checks every link and #anchor in docs/ against the
+    built files; 'external' also requests outside URLs (results cached
+    for LINK_CACHE_TTL) and 'cached' uses only cached external results.
+    Broken links count as failures. minify=True minifies the generated
+    pages (with the shell's SVG icons moved to a sprite) and reports the
+    bytes saved. images=True gives raster images referenced from the
+    generated pages resized WebP variants (needs Pillow) and rewrites their
+    <img> tags with srcset and lazy loading. critical=True inlines each page's critical
+    CSS and loads fonts and full stylesheets without blocking render.
+    Pages link the blog feed only once publish-blog.py has written it.
+    Returns the number of files that failed.
+    """
+    website_dir = site_dir(root)
     output_dir = website_dir / 'docs'
     content_dir = website_dir / 'content'
+    assets = asset_names(root)
 
     # Create output directory
     output_dir.mkdir(exist_ok=True)
 
+    old_manifest = load_manifest(output_dir / MANIFEST_NAME, MANIFEST_VERSION) if incremental else {}
+    manifest = {'version': MANIFEST_VERSION, 'assets': {}, 'pages': {}}
+    skipped = 0
+
     # Copy OAT CSS and JS files
-    oat_css = website_dir / 'oat.min.css'
-    oat_js = website_dir / 'oat.min.js'
-    if oat_css.exists():
-        shutil.copy(oat_css, output_dir / 'oat.min.css')
-        print(f"✓ Copied oat.min.css")
-    if oat_js.exists():
-        shutil.copy(oat_js, output_dir / 'oat.min.js')
-        print(f"✓ Copied oat.min.js")
-
-    # Copy index.html
-    index_html = website_dir / 'index.html'
-    if index_html.exists():
-        shutil.copy(index_html, output_dir / 'index.html')
-        print(f"✓ Copied index.html")
+    for name in STATIC_ASSETS:
+        asset_path = website_dir / name
+        if not asset_path.exists():
+            continue
+        asset_hash = hash_file(asset_path)
+        entry = {'input': asset_hash, 'output': asset_hash}
+        manifest['assets'][name] = entry
+        if is_fresh(old_manifest.get('assets', {}).get(name), asset_hash, output_dir / name):
+            skipped += 1
+        else:
+            with span('copy', file=name):
+                shutil.copy(asset_path, output_dir / name)
+            print(f"✓ Copied {name}")
+
+        # Fingerprinted copy; an unchanged hash means the file is already there
+        with span('copy', file=assets[name]):
+            fingerprinted, written = write_fingerprinted(
+                output_dir, asset_path.stem, asset_path.suffix, asset_path.read_bytes())
+        if written:
+            print(f"✓ Copied {name} as {fingerprinted}")
+        else:
+            skipped += 1
+
+    # index.html, with its asset references pointed at the fingerprinted copies
+    index_path = website_dir / 'index.html'
+    if index_path.exists():
+        index_html = rewrite_asset_urls(index_path.read_text(), assets)
+        index_hash = hash_bytes(index_html.encode('utf-8'))
+        old_entry = old_manifest.get('assets', {}).get('index.html')
+        if is_fresh(old_entry, index_hash, output_dir / 'index.html'):
+            # Keeps the output hash of an image-rewritten copy
+            manifest['assets']['index.html'] = old_entry
+            skipped += 1
+        else:
+            manifest['assets']['index.html'] = {'input': index_hash, 'output': index_hash}
+            with span('copy', file='index.html'):
+                with open(output_dir / 'index.html', 'w') as f:
+                    f.write(index_html)
+            print("✓ Copied index.html")
+
+    # Shared stylesheet, written once per content hash
+    css_name, css_written = write_fingerprinted(output_dir, 'site', '.css', SITE_CSS)
+    if css_written:
+        print(f"✓ Wrote {css_name}")
+    else:
+        skipped += 1
+
+    if minify:
+        sprite_name, sprite_written = write_fingerprinted(output_dir, 'sprite', '.svg', SITE_SPRITE.svg)
+        if sprite_written:
+            print(f"✓ Wrote {sprite_name}")
+
+    asset_manifest = json.dumps(assets, indent=2, sort_keys=True) + '\n'
+    if write_if_changed(output_dir / ASSET_MANIFEST_NAME, asset_manifest):
+        print(f"✓ Wrote {ASSET_MANIFEST_NAME}")
 
     # Ensure content directory exists
     content_dir.mkdir(exist_ok=True)
 
-    # Page definitions
-    pages = {
-        'about.md': ('About Duet Company', 'about', 'about.html'),
-        'features.md': ('Features - AI Data Labs', 'features', 'features.html'),
-        'pricing.md': ('Pricing - AI Data Labs', 'pricing', 'pricing.html'),
-        'contact.md': ('Contact - AI Data Labs', 'contact', 'contact.html'),
-    }
+    shell_hash = template_hash(root)
+    feed = (output_dir / FEED_PATH).exists()
 
-    for md_file, (page_title, active_nav, html_file) in pages.items():
+    # Work out which pages need rendering, then render and write them
+    # (possibly in parallel), reporting back in page order.
+    to_render = []
+    for md_file, (page_title, active_nav, html_file) in PAGES.items():
         md_path = content_dir / md_file
         if md_path.exists():
-            metadata, content = read_markdown_file(md_path)
-            title = metadata.get('title', page_title)
-            html_content = parse_markdown(content)
-
-            # Wrap content in page header
-            page_header = f'<div class="page-header">\n'
-            page_header += f'    <div class="page-label">{md_file.replace(".md", "").title()}</div>\n'
-            page_header += f'    <h1 class="page-title">{title.replace(" - AI Data Labs", "")}</h1>\n'
-            page_header += f'</div>\n'
-
-            # For pricing page, add subtitle
-            if md_file == 'pricing.md':
-                page_header = f'<div class="page-header">\n'
-                page_header += f'    <div class="page-label">Pricing</div>\n'
-                page_header += f'    <h1 class="page-title">Simple, transparent pricing</h1>\n'
-                page_header += f'    <p class="page-subtitle">Choose the plan that fits your needs. All plans include a 14-day free trial.</p>\n'
-                page_header += f'</div>\n'
+            page_key = f'{shell_hash}\0{hash_file(md_path)}\0{page_title}\0{active_nav}\0{minify}\0{critical}\0{feed}'
+            input_hash = hash_bytes(page_key.encode('utf-8'))
+            old_entry = old_manifest.get('pages', {}).get(html_file)
+            if is_fresh(old_entry, input_hash, output_dir / html_file):
+                manifest['pages'][html_file] = old_entry
+                skipped += 1
+                continue
+            stream = md_path.stat().st_size >= stream_threshold
+            to_render.append((md_path, md_file, page_title, active_nav,
+                              output_dir / html_file, stream, minify, critical, feed, root, input_hash))
+        else:
+            print(f"  Skipping {md_file} (not found)")
 
-            full_content = page_header + html_content
+    results = map_files(write_page, [job[:10] for job in to_render], jobs=jobs)
 
-            page_html = generate_page_html(title, full_content, active_nav)
+    failed = 0
+    raw_total = written_total = 0
+    for job, (sizes, error) in zip(to_render, results):
+        output_path, stream, _, _, _, _, input_hash = job[4:]
+        html_file = output_path.name
+        if error:
+            print(f"✗ Failed {html_file} ({job[1]}): {error}")
+            failed += 1
+            continue
 
-            with open(output_dir / html_file, 'w') as f:
-                f.write(page_html)
-            print(f"✓ Generated {html_file}")
+        manifest['pages'][html_file] = {
+            'input': input_hash,
+            'output': hash_file(output_path),
+        }
+        print(f"✓ Generated {html_file}{' (streamed)' if stream else ''}")
+        if sizes:
+            raw_total += sizes[0]
+            written_total += sizes[1]
+
+    if minify and written_total:
+        print(f"✓ Minified pages: {format_savings(raw_total, written_total)}")
+
+    if images:
+        # Generated pages and the copied index.html, each with the manifest
+        # section that tracks it
+        owned = {html_file: manifest['pages'] for html_file in manifest['pages']}
+        if 'index.html' in manifest['assets']:
+            owned['index.html'] = manifest['assets']
+        image_count, encoded, rewritten, image_errors = optimize_images(output_dir, owned, jobs=jobs)
+        for target, error in image_errors:
+            print(f"✗ Failed {target}: {error}")
+        failed += len(image_errors)
+        # Rewritten pages keep their manifest entries valid
+        for html_file in rewritten:
+            owned[html_file][html_file]['output'] = hash_file(output_dir / html_file)
+        if image_count:
+            print(f"✓ Images: {image_count} referenced ({encoded} encoded, "
+                  f"{len(rewritten)} pages rewritten)")
+            if Image is None:
+                print("  (Pillow not installed: responsive variants skipped; pip install Pillow)")
+
+    save_manifest(output_dir / MANIFEST_NAME, manifest)
+
+    if search:
+        page_count, tokenized, shards = build_search_index(output_dir, jobs=jobs)
+        print(f"✓ Search index: {page_count} pages ({tokenized} tokenized, {shards} shards updated)")
+
+    if links:
+        problems = check_links(output_dir, jobs=jobs, external=links != 'internal',
+                               offline=links == 'cached', ttl=LINK_CACHE_TTL)
+        if problems:
+            print(f"✗ Broken links ({len(problems)}):")
+            print(format_problems(problems))
+            failed += len(problems)
         else:
-            print(f"  Skipping {md_file} (not found)")
+            print(f"✓ No broken links ({links} check)")
+
+    if compress:
+        rows = compress_tree(output_dir, jobs=jobs)
+        failed += sum(1 for _, _, error in rows if error)
+        print(f"\n✓ Compressed {len(rows)} files in {output_dir}")
+        print(format_size_table(rows))
 
     print(f"\n✓ Site built to {output_dir}")
     print(f"  Files: {len(list(output_dir.glob('*.html')))}")
+    if incremental:
+        print(f"  Unchanged: {skipped}")
+    if failed:
+        print(f"  Failed: {failed}")
+    return failed
+
+def load_blog_publisher():
+    """Import scripts/publish-blog.py (its file name is not a module name)."""
+    path = Path(__file__).parent / 'scripts' / 'publish-blog.py'
+    spec = importlib.util.spec_from_file_location('publish_blog', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def serve_site(port=8000):
+    """Build once, then serve docs/ and rebuild pages as content/ changes."""
+    website_dir = Path(__file__).parent
+    output_dir = website_dir / 'docs'
+    content_dir = website_dir / 'content'
+    blog_dir = content_dir / 'blog'
+    blog_output_dir = output_dir / 'blog'
+
+    generate_site(incremental=True)
+    blog = load_blog_publisher()
+    blog_output_dir.mkdir(parents=True, exist_ok=True)
+    write_fingerprinted(blog_output_dir, 'blog', '.css', blog.BLOG_STYLESHEET)
+
+    def rebuild(path):
+        """Re-render the single output that depends on a changed source."""
+        path = Path(path)
+        if path.parent == content_dir and path.name in PAGES:
+            page_title, active_nav, html_file = PAGES[path.name]
+            stream = path.stat().st_size >= STREAM_THRESHOLD
+            write_page(path, path.name, page_title, active_nav, output_dir / html_file, stream,
+                       feed=(output_dir / FEED_PATH).exists())
+            return [html_file]
+        if path.parent == blog_dir:
+            html_file = f'blog/{path.stem}.html'
+            (output_dir / html_file).write_text(blog.render_post(path), encoding='utf-8')
+            return [html_file]
+        return []
+
+    serve(output_dir, [content_dir, blog_dir], rebuild, port=port)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Build the Duet Company site into docs/.')
+    parser.add_argument('command', nargs='?', choices=('build', 'serve'), default='build',
+                        help='build once (default), or serve docs/ and rebuild on content changes')
+    parser.add_argument('--port', type=int, default=8000, help='port for serve (default: 8000)')
+    parser.add_argument('--incremental', action='store_true',
+                        help=f'only rebuild outputs whose inputs changed (tracked in docs/{MANIFEST_NAME})')
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help='render pages across N processes (0 = all cores, default: 1)')
+    parser.add_argument('--compress', action='store_true',
+                        help='write .gz/.br siblings for HTML, CSS and JS in docs/ and report sizes')
+    parser.add_argument('--stream', action='store_true',
+                        help=f'stream every page to disk line by line (default: pages of '
+                             f'{STREAM_THRESHOLD // 1024 // 1024} MB or more)')
+    parser.add_argument('--minify', action='store_true',
+                        help='minify generated pages (whitespace, comments, SVG sprite) and report bytes saved')
+    parser.add_argument('--critical-css', dest='critical', action='store_true',
+                        help='inline critical CSS and load fonts and stylesheets without blocking render')
+    parser.add_argument('--no-search', dest='search', action='store_false',
+                        help='skip refreshing the client-side search index in docs/search/')
+    parser.add_argument('--no-images', dest='images', action='store_false',
+                        help='skip generating responsive image variants and rewriting <img> tags')
+    parser.add_argument('--check-links', nargs='?', const='internal',
+                        choices=('internal', 'external', 'cached'), metavar='MODE',
+                        help='check links in docs/: internal (default), external (also fetch '
+                             'outside URLs) or cached (external results from the cache only)')
+    parser.add_argument('--profile', nargs='?', const='build-trace.json', metavar='TRACE',
+                        help='time each phase and file; write a Chrome trace (default: build-trace.json)')
+    parser.add_argument('--profile-top', type=int, default=10, metavar='N',
+                        help='slowest files to list in the profile summary (default: 10)')
+    args = parser.parse_args(argv)
+    if args.command == 'serve':
+        serve_site(port=args.port)
+        return 0
+    PROFILER.enabled = bool(args.profile)
+    with span('generate_site'):
+        failed = generate_site(incremental=args.incremental, jobs=args.jobs, compress=args.compress,
+                               stream_threshold=0 if args.stream else STREAM_THRESHOLD,
+                               search=args.search, links=args.check_links, minify=args.minify,
+                               images=args.images, critical=args.critical)
+    if args.profile:
+        PROFILER.write_trace(args.profile)
+        print(f"\n{PROFILER.summary(args.profile_top)}")
+        print(f"  Trace written to {args.profile} (open in https://ui.perfetto.dev)")
+    return 1 if failed else 0
 
 if __name__ == '__main__':
-    generate_site()
+    sys.exit(main())
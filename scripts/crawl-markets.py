@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Crawl every Polymarket event or market from the Gamma API
+
+Pages through /events or /markets with offset pagination, fetching several
+pages at once under a concurrency and requests-per-second limit, and
+streams the records to newline-delimited JSON in page order. Progress is
+checkpointed to <output>.checkpoint.json after every page, so an
+interrupted crawl resumes where it stopped instead of starting over.
+
+Usage:
+  python3 crawl-markets.py -o events.ndjson
+  python3 crawl-markets.py --endpoint markets --all -o markets.ndjson -j 8 --rate 5
+  python3 crawl-markets.py -o events.ndjson --parquet events.parquet   # needs pyarrow
+  python3 crawl-markets.py -o events.ndjson --index   # also fill token_index.py
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # optional: pip install pyarrow
+    pa = None
+
+from gamma_client import GammaClient, RateLimiter, env_options, market_outcomes, normalize
+
+CHECKPOINT_VERSION = 1
+PAGE_SIZE = 100
+DEFAULT_CONCURRENCY = 4
+DEFAULT_RATE = 5.0  # requests per second
+
+# One Parquet row per market, with its event when crawling /events
+PARQUET_COLUMNS = (
+    ("event_slug", "string"), ("event_title", "string"), ("market_id", "string"),
+    ("market_slug", "string"), ("question", "string"), ("active", "bool"), ("closed", "bool"),
+    ("end_date", "string"), ("updated_at", "string"), ("volume", "float64"),
+    ("liquidity", "float64"), ("outcomes", "list<string>"), ("token_ids", "list<string>"),
+    ("prices", "list<float64>"),
+)
+
+def _float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+def market_rows(record, endpoint):
+    """Flatten one crawled record into per-market rows for PARQUET_COLUMNS."""
+    if endpoint == "events":
+        event, markets = record, record.get("markets", [])
+    else:
+        events = record.get("events") or [{}]
+        event, markets = events[0], [record]
+    for market in markets:
+        outcomes = market_outcomes(market)
+        yield {
+            "event_slug": event.get("slug"),
+            "event_title": event.get("title"),
+            "market_id": str(market.get("id")) if market.get("id") is not None else None,
+            "market_slug": market.get("slug"),
+            "question": market.get("question"),
+            "active": market.get("active"),
+            "closed": market.get("closed"),
+            "end_date": market.get("endDate") or market.get("end_date_iso"),
+            "updated_at": market.get("updatedAt"),
+            "volume": _float(market.get("volume")),
+            "liquidity": _float(market.get("liquidity")),
+            "outcomes": [str(outcome) for outcome, _, _ in outcomes],
+            "token_ids": [token_id for _, token_id, _ in outcomes],
+            "prices": [price for _, _, price in outcomes],
+        }
+
+def write_parquet(ndjson_path, parquet_path, endpoint, batch_rows=10000):
+    """Convert a finished crawl to a Parquet file, streaming in row batches."""
+    types = {"string": pa.string(), "bool": pa.bool_(), "float64": pa.float64(),
+             "list<string>": pa.list_(pa.string()), "list<float64>": pa.list_(pa.float64())}
+    schema = pa.schema([(name, types[kind]) for name, kind in PARQUET_COLUMNS])
+    rows = 0
+    with pq.ParquetWriter(parquet_path, schema, compression="zstd") as writer:
+        batch = []
+        with open(ndjson_path, "r") as f:
+            for line in f:
+                batch.extend(market_rows(json.loads(line), endpoint))
+                if len(batch) >= batch_rows:
+                    writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+                    rows += len(batch)
+                    batch = []
+        if batch:
+            writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+            rows += len(batch)
+    return rows
+
+class Checkpoint:
+    """Crawl progress: next page offset and output size, saved atomically."""
+
+    def __init__(self, path, query):
+        self.path = Path(path)
+        self.query = query
+        self.offset = 0
+        self.bytes = 0
+        self.records = 0
+        self.done = False
+
+    def load(self):
+        """Resume from disk; return False when there is nothing to resume."""
+        try:
+            with open(self.path, "r") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if state.get("version") != CHECKPOINT_VERSION:
+            return False
+        if state.get("query") != self.query:
+            raise SystemExit(f"❌ {self.path} is for a different crawl ({state.get('query')}); "
+                             f"use --restart to start over")
+        self.offset = state["offset"]
+        self.bytes = state["bytes"]
+        self.records = state["records"]
+        self.done = state["done"]
+        return True
+
+    def save(self):
+        state = {"version": CHECKPOINT_VERSION, "query": self.query, "offset": self.offset,
+                 "bytes": self.bytes, "records": self.records, "done": self.done}
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(state, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+async def crawl(client, endpoint, params, start, page_size, concurrency, rate, on_page):
+    """Fetch pages from offset `start` until a short page, calling on_page in order.
+
+    Up to `concurrency` pages are in flight at once; on_page(offset, items)
+    always sees them in offset order, so output and checkpoints stay
+    contiguous whichever page arrives first.
+    """
+    asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=concurrency))
+    limiter = RateLimiter(rate)
+
+    async def fetch(offset):
+        await limiter.acquire()
+        data = await asyncio.to_thread(client.get, f"/{endpoint}",
+                                       {**params, "limit": page_size, "offset": offset}, 0)
+        return normalize(data)
+
+    pending = {}
+    next_fetch = start
+    offset = start
+    try:
+        while True:
+            while len(pending) < concurrency:
+                pending[next_fetch] = asyncio.ensure_future(fetch(next_fetch))
+                next_fetch += page_size
+            items = await pending.pop(offset)
+            on_page(offset, items)
+            if len(items) < page_size:
+                return
+            offset += page_size
+    finally:
+        for task in pending.values():
+            task.cancel()
+        await asyncio.gather(*pending.values(), return_exceptions=True)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Crawl all Gamma events or markets to NDJSON")
+    parser.add_argument("-o", "--output", required=True, help="NDJSON file to write")
+    parser.add_argument("--endpoint", choices=("events", "markets"), default="events",
+                        help="what to crawl (default: events, which include their markets)")
+    parser.add_argument("--all", action="store_true", help="include closed events/markets")
+    parser.add_argument("-j", "--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help=f"pages in flight at once (default: {DEFAULT_CONCURRENCY})")
+    parser.add_argument("--rate", type=float, default=DEFAULT_RATE,
+                        help=f"max requests per second, 0 = no limit; client retries are not "
+                             f"counted (default: {DEFAULT_RATE:g})")
+    parser.add_argument("--page-size", type=int, default=PAGE_SIZE,
+                        help=f"records per request (default: {PAGE_SIZE})")
+    parser.add_argument("--restart", action="store_true", help="ignore any checkpoint and start over")
+    parser.add_argument("--parquet", metavar="FILE",
+                        help="also write a columnar Parquet file, one row per market (needs pyarrow)")
+    parser.add_argument("--index", action="store_true",
+                        help="add crawled events to the local token index (events only)")
+    args = parser.parse_args(argv)
+
+    if args.concurrency < 1:
+        parser.error("-j/--concurrency must be at least 1")
+    if args.rate < 0:
+        parser.error("--rate must be 0 (no limit) or more")
+    if args.page_size < 1:
+        parser.error("--page-size must be at least 1")
+    if args.parquet and pa is None:
+        parser.error("--parquet needs pyarrow (pip install pyarrow)")
+    if args.index and args.endpoint != "events":
+        parser.error("--index needs --endpoint events")
+
+    params = {"order": "id", "ascending": "true"}  # stable order while paging
+    if not args.all:
+        params["closed"] = "false"
+    output = Path(args.output)
+    checkpoint_path = output.with_name(output.name + ".checkpoint.json")
+    query = {"endpoint": args.endpoint, "params": params, "page_size": args.page_size}
+    checkpoint = Checkpoint(checkpoint_path, query)
+    resumed = not args.restart and checkpoint.load()
+    if resumed and (not output.exists() or output.stat().st_size < checkpoint.bytes):
+        # The records the checkpoint counts are gone; resuming would leave a hole
+        print(f"⚠️  {output} is missing or shorter than its checkpoint; starting over")
+        checkpoint = Checkpoint(checkpoint_path, query)
+        resumed = False
+
+    if checkpoint.done:
+        print(f"✅ Crawl already complete: {checkpoint.records} record(s) in {output}")
+    else:
+        if resumed:
+            print(f"⏭️  Resuming at offset {checkpoint.offset} ({checkpoint.records} record(s) so far)")
+        index = None
+        if args.index:
+            from token_index import TokenIndex
+            index = TokenIndex()
+        started = time.monotonic()
+        # Drop anything written after the last checkpoint
+        with open(output, "r+b" if resumed else "wb") as out:
+            out.truncate(checkpoint.bytes)
+            out.seek(checkpoint.bytes)
+
+            def on_page(offset, items):
+                for item in items:
+                    out.write(json.dumps(item, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+                    out.write(b"\n")
+                out.flush()
+                os.fsync(out.fileno())
+                if index:
+                    for item in items:
+                        index.add_event(item)
+                    index.db.commit()
+                checkpoint.offset = offset + args.page_size
+                checkpoint.bytes = out.tell()
+                checkpoint.records += len(items)
+                checkpoint.done = len(items) < args.page_size
+                checkpoint.save()
+                print(f"📄 offset {offset}: {len(items)} record(s), {checkpoint.records} total")
+
+            with GammaClient(pool_size=args.concurrency, **env_options()) as client:
+                try:
+                    asyncio.run(crawl(client, args.endpoint, params, checkpoint.offset, args.page_size,
+                                      args.concurrency, args.rate, on_page))
+                except KeyboardInterrupt:
+                    print(f"\n⏸️  Interrupted; rerun to resume at offset {checkpoint.offset}")
+                    return 130
+                except Exception as e:
+                    print(f"❌ Crawl stopped at offset {checkpoint.offset}: {e}")
+                    print("   Rerun the same command to resume")
+                    return 1
+                finally:
+                    if index:
+                        index.close()
+        print(f"\n🎉 Crawled {checkpoint.records} record(s) into {output} "
+              f"in {time.monotonic() - started:.1f}s")
+
+    if args.parquet:
+        rows = write_parquet(output, args.parquet, args.endpoint)
+        print(f"✅ Wrote {rows} market row(s) to {args.parquet}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,54 +1,53 @@
 #!/usr/bin/env python3
 """
 Find Polymarket token IDs by searching for active markets
+
+Lookups are answered from the local token index (token_index.py) and fall
+back to the Gamma API on a miss; events fetched that way are added to the
+index for next time. Prices from the index are labelled with the time
+they were indexed; refresh it (token_index.py refresh) for current ones.
 """
 
 import requests
-import json
 import sys
 
+from gamma_client import get_client, market_outcomes
+from token_index import open_index
+
 def find_token_by_outcome(market_slug, outcome_name):
     """Find token ID for a specific outcome in a market"""
     
-    # Try to get event by slug
-    url = f"https://gamma-api.polymarket.com/events?slug={market_slug}"
-    
+    index = open_index()
     try:
-        resp = requests.get(url, timeout=30)
-        resp.raise_for_status()
-        data = resp.json()
-        
-        # Handle response format
-        if isinstance(data, dict):
-            events = data.get('data', [])
-        elif isinstance(data, list):
-            events = data
-        else:
-            print(f"❌ Unexpected response format: {type(data)}")
-            return None
+        event = index.event(market_slug) if index else None
+        if event is None:
+            # Not indexed yet: get event by slug, and remember it
+            event = get_client().event(market_slug)
+            if event and index:
+                index.add_event(event)
+                index.db.commit()
         
-        if not events:
+        if not event:
             print(f"❌ No event found for slug: {market_slug}")
             return None
         
-        event = events[0]
         markets = event.get('markets', [])
         
         print(f"\n🎯 Event: {event.get('title', 'Unknown')}")
         print(f"   Slug: {event.get('slug', 'N/A')}")
-        print(f"   Markets: {len(markets)}\n")
+        print(f"   Markets: {len(markets)}")
+        if event.get('indexed_at'):
+            print(f"   Prices as of: {event['indexed_at']} (local index)")
+        print()
         
         # Search through all markets and tokens
         for m_idx, market in enumerate(markets, 1):
             question = market.get('question', 'N/A')
-            tokens = market.get('tokens', [])
             
             print(f"Market {m_idx}: {question[:60]}")
             
-            for t_idx, token in enumerate(tokens, 1):
-                outcome = token.get('outcome', 'N/A')
-                token_id = token.get('token_id', 'N/A')
-                price = float(token.get('price', 0)) * 100
+            for t_idx, (outcome, token_id, price) in enumerate(market_outcomes(market), 1):
+                price = (price or 0) * 100
                 
                 print(f"  {t_idx}. {outcome}")
                 print(f"     Token ID: {token_id}")
@@ -63,44 +62,35 @@ def find_token_by_outcome(market_slug, outcome_name):
     except Exception as e:
         print(f"❌ Unexpected error: {e}")
         return None
+    finally:
+        if index:
+            index.close()
 
 def search_markets(query, limit=10):
     """Search for markets by query string"""
     
-    url = f"https://gamma-api.polymarket.com/markets?query={query}&limit={limit}"
-    
+    index = open_index()
     try:
-        resp = requests.get(url, timeout=30)
-        resp.raise_for_status()
-        data = resp.json()
-        
-        # Handle response format
-        if isinstance(data, dict):
-            markets = data.get('data', [])
-        elif isinstance(data, list):
-            markets = data
-        else:
-            print(f"❌ Unexpected response format: {type(data)}")
-            return []
+        markets = index.search(query, limit) if index else []
+        if not markets:
+            markets = get_client().markets(query=query, limit=limit)
         
         print(f"\n🔍 Search Results for: '{query}'")
         print(f"Found {len(markets)} markets\n")
         
         for i, market in enumerate(markets, 1):
             question = market.get('question', 'N/A')
-            slug = market.get('slug', 'N/A')
-            tokens = market.get('tokens', [])
+            slug = market.get('event_slug') or market.get('slug', 'N/A')
             
             print(f"{i}. {question[:70]}")
             print(f"   Slug: {slug}")
+            if market.get('indexed_at'):
+                print(f"   Prices as of: {market['indexed_at']} (local index)")
             
-            if tokens:
-                for t in tokens[:3]:  # Show first 3 tokens
-                    outcome = t.get('outcome', 'N/A')
-                    token_id = t.get('token_id', 'N/A')
-                    price = float(t.get('price', 0)) * 100
-                    
-                    print(f"   - {outcome}: {price:.1f}% (Token: {token_id})")
+            for outcome, token_id, price in market_outcomes(market)[:3]:  # Show first 3 tokens
+                price = (price or 0) * 100
+                
+                print(f"   - {outcome}: {price:.1f}% (Token: {token_id})")
             print()
         
         return markets
@@ -111,6 +101,9 @@ def search_markets(query, limit=10):
     except Exception as e:
         print(f"❌ Unexpected error: {e}")
         return []
+    finally:
+        if index:
+            index.close()
 
 if __name__ == "__main__":
     if len(sys.argv) < 2:
@@ -5,36 +5,17 @@ Find Polymarket token IDs from market slugs
 
 import requests
 
+from gamma_client import get_client
+
 def find_market(slug=None, query=None):
     """Find market token ID from slug or search query"""
     try:
         if slug:
             # Get specific market by slug
-            resp = requests.get(
-                "https://gamma-api.polymarket.com/markets",
-                params={"slug": slug}
-            )
+            markets = get_client().markets(slug=slug)
         else:
             # Search markets
-            resp = requests.get(
-                "https://gamma-api.polymarket.com/markets",
-                params={"query": query, "limit": 10}
-            )
-
-        if resp.status_code != 200:
-            print(f"❌ API Error: {resp.status_code}")
-            return
-
-        data = resp.json()
-
-        # Handle different response structures
-        if isinstance(data, dict):
-            markets = data.get("data", [])
-        elif isinstance(data, list):
-            markets = data
-        else:
-            print(f"❌ Unexpected response structure: {type(data)}")
-            return
+            markets = get_client().markets(query=query, limit=10)
 
         if not markets:
             print("❌ No markets found")
@@ -58,6 +39,8 @@ def find_market(slug=None, query=None):
                     print(f"        Token ID: {token.get('token_id', 'N/A')}")
                 print()
 
+    except requests.exceptions.HTTPError as e:
+        print(f"❌ API Error: {e.response.status_code}")
     except Exception as e:
         print(f"❌ Error: {e}")
 
@@ -0,0 +1,238 @@
+"""
+Shared client for the Polymarket Gamma API (gamma-api.polymarket.com)
+
+One pooled requests.Session (keep-alive), bounded retries with jittered
+exponential backoff, and a TTL response cache keyed by endpoint and params,
+held in memory and on disk so repeated lookups across script runs are
+near-free.
+
+Environment:
+  GAMMA_CACHE_DIR   disk cache directory (default: ~/.cache/gamma-api,
+                    empty to keep the cache in memory only)
+  GAMMA_CACHE_TTL   seconds a cached response stays fresh (default: 60)
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import random
+import time
+from pathlib import Path
+
+import requests
+from requests.adapters import HTTPAdapter
+
+GAMMA_API = "https://gamma-api.polymarket.com"
+USER_AGENT = "duet-company-gamma-client/1.0"
+
+# (connect, read) timeouts in seconds
+DEFAULT_TIMEOUT = (5, 30)
+DEFAULT_TTL = 60
+MAX_RETRIES = 3
+BACKOFF_BASE = 0.5  # seconds; doubled per attempt, with full jitter
+BACKOFF_CAP = 8.0
+POOL_SIZE = 10
+
+# Responses worth retrying; other errors are raised straight away
+RETRY_STATUSES = frozenset((429, 500, 502, 503, 504))
+
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "gamma-api"
+
+def normalize(data):
+    """Return the list of items from a Gamma response.
+
+    Endpoints answer either with a bare list or with {"data": [...]}.
+    Raises ValueError for anything else.
+    """
+    if isinstance(data, list):
+        return data
+    if isinstance(data, dict) and isinstance(data.get("data"), list):
+        return data["data"]
+    raise ValueError(f"Unexpected response format: {type(data).__name__}")
+
+def _json_list(value):
+    """Gamma sends some list fields as JSON-encoded strings."""
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except ValueError:
+            return []
+    return value if isinstance(value, list) else []
+
+def market_outcomes(market):
+    """Return [(outcome, clob token id, price)] for one market.
+
+    Uses clobTokenIds/outcomes/outcomePrices when present, else the older
+    tokens list. Prices are floats (None when missing).
+    """
+    token_ids = _json_list(market.get("clobTokenIds"))
+    outcomes = _json_list(market.get("outcomes"))
+    if token_ids and len(token_ids) == len(outcomes):
+        prices = _json_list(market.get("outcomePrices"))
+        prices += [None] * (len(outcomes) - len(prices))
+        return [(outcome, str(token_id), float(price) if price is not None else None)
+                for outcome, token_id, price in zip(outcomes, token_ids, prices)]
+    return [(token.get("outcome"), str(token.get("token_id")),
+             float(token["price"]) if token.get("price") is not None else None)
+            for token in market.get("tokens", [])]
+
+def backoff_delay(attempt, retry_after=None):
+    """Seconds to wait before retry number `attempt` (0-based)."""
+    delay = random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt))
+    if retry_after:
+        try:
+            delay = max(delay, min(float(retry_after), BACKOFF_CAP))
+        except ValueError:
+            pass  # HTTP-date form; the jittered delay will do
+    return delay
+
+class RateLimiter:
+    """Asyncio token bucket: at most `rate` acquisitions per second, bursts of `burst`.
+
+    A rate of 0 or less means no limit.
+    """
+
+    def __init__(self, rate, burst=None):
+        self.rate = rate
+        self.capacity = burst or max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        if self.rate <= 0:
+            return
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+class GammaClient:
+    """Gamma API client with a pooled session, retries and a TTL cache."""
+
+    def __init__(self, base_url=GAMMA_API, timeout=DEFAULT_TIMEOUT, ttl=DEFAULT_TTL,
+                 retries=MAX_RETRIES, cache_dir=None, pool_size=POOL_SIZE):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.ttl = ttl
+        self.retries = retries
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self._memory = {}  # cache key -> (expires, data)
+
+        self.session = requests.Session()
+        self.session.headers.update({"User-Agent": USER_AGENT, "Accept": "application/json"})
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.session.close()
+
+    def _key(self, path, params):
+        """Cache key: endpoint plus params in a canonical order."""
+        canonical = json.dumps([path, sorted((params or {}).items())], default=str)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def _cached(self, key):
+        now = time.time()
+        entry = self._memory.get(key)
+        if entry and entry[0] > now:
+            return entry
+        if self.cache_dir:
+            try:
+                with open(self.cache_dir / f"{key}.json", "r") as f:
+                    stored = json.load(f)
+            except (OSError, ValueError):
+                return None
+            if stored.get("expires", 0) > now:
+                entry = (stored["expires"], stored["data"])
+                self._memory[key] = entry
+                return entry
+        return None
+
+    def _store(self, key, data, ttl):
+        expires = time.time() + ttl
+        self._memory[key] = (expires, data)
+        if self.cache_dir:
+            try:
+                self.cache_dir.mkdir(parents=True, exist_ok=True)
+                tmp_path = self.cache_dir / f"{key}.json.{os.getpid()}.tmp"
+                with open(tmp_path, "w") as f:
+                    json.dump({"expires": expires, "data": data}, f)
+                os.replace(tmp_path, self.cache_dir / f"{key}.json")
+            except OSError:
+                pass  # the disk cache is an optimization only
+
+    def _fetch(self, path, params):
+        """GET base_url + path, retrying transient failures; return parsed JSON."""
+        url = f"{self.base_url}{path}"
+        for attempt in range(self.retries + 1):
+            last = attempt == self.retries
+            try:
+                resp = self.session.get(url, params=params, timeout=self.timeout)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                if last:
+                    raise
+                time.sleep(backoff_delay(attempt))
+                continue
+            if resp.status_code in RETRY_STATUSES and not last:
+                time.sleep(backoff_delay(attempt, resp.headers.get("Retry-After")))
+                continue
+            resp.raise_for_status()
+            return resp.json()
+
+    def get(self, path, params=None, ttl=None):
+        """GET an endpoint such as "/events", served from the cache while fresh.
+
+        ttl overrides the client default for this call (0 skips the cache).
+        """
+        ttl = self.ttl if ttl is None else ttl
+        key = self._key(path, params)
+        if ttl > 0:
+            cached = self._cached(key)
+            if cached:
+                return cached[1]
+        data = self._fetch(path, params)
+        if ttl > 0:
+            self._store(key, data, ttl)
+        return data
+
+    def events(self, ttl=None, **params):
+        """List events matching params, e.g. events(slug=...)."""
+        return normalize(self.get("/events", params, ttl))
+
+    def markets(self, ttl=None, **params):
+        """List markets matching params, e.g. markets(query=..., limit=10)."""
+        return normalize(self.get("/markets", params, ttl))
+
+    def event(self, slug, ttl=None):
+        """The event with this slug, or None."""
+        events = self.events(ttl, slug=slug)
+        return events[0] if events else None
+
+def env_options():
+    """GammaClient keyword arguments from GAMMA_CACHE_DIR and GAMMA_CACHE_TTL."""
+    cache_dir = os.environ.get("GAMMA_CACHE_DIR", str(DEFAULT_CACHE_DIR))
+    return {"ttl": float(os.environ.get("GAMMA_CACHE_TTL", DEFAULT_TTL)),
+            "cache_dir": cache_dir or None}
+
+_client = None
+
+def get_client():
+    """Process-wide client configured from the environment."""
+    global _client
+    if _client is None:
+        _client = GammaClient(**env_options())
+    return _client
@@ -3,27 +3,15 @@
 Extract Polymarket token IDs from events - for trading
 """
 
-import requests
-import json
 import sys
 
+from gamma_client import get_client
+
 def get_token_ids(market_slug):
     """Get clobTokenIds for all markets in an event"""
     
-    url = f"https://gamma-api.polymarket.com/events?slug={market_slug}"
-    
     try:
-        resp = requests.get(url, timeout=30)
-        resp.raise_for_status()
-        data = resp.json()
-        
-        if isinstance(data, dict):
-            events = data.get('data', [])
-        elif isinstance(data, list):
-            events = data
-        else:
-            print(f"❌ Unexpected format")
-            return {}
+        events = get_client().events(slug=market_slug)
         
         if not events:
             print(f"❌ No event found")
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the Polymarket CLOB price feeds, for offline testing
+
+Random-walks an order book per token and serves it the way the real
+feeds do. Tokens named with --static keep a fixed book, so polling them
+answers 304 Not Modified tick after tick:
+  - WebSocket market channel (needs websockets): subscribe with
+    {"assets_ids": [...], "type": "market"}, get a "book" snapshot per
+    token, then "price_change" and "last_trade_price" events every tick;
+    a text PING is answered with PONG
+  - REST GET /book?token_id=... with an ETag, answering 304 Not Modified
+    to a matching If-None-Match
+
+Usage:
+  python3 mock_price_feed.py [--ws-port 8765] [--http-port 8766] [--tick 0.2] [--static 102 ...]
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+try:
+    import websockets
+except ImportError:  # optional: pip install websockets
+    websockets = None
+
+TICK = 0.01  # price increment
+LEVELS = 3   # book depth per side
+
+class MockFeed:
+    """Random-walk order books for any token IDs asked about.
+
+    Tokens in `static` keep their first book forever.
+    """
+
+    def __init__(self, seed=None, static=()):
+        self.random = random.Random(seed)
+        self.mids = {}
+        self.books = {}  # token -> {"BUY": {price: size}, "SELL": {...}}
+        self.static = {str(token_id) for token_id in static}
+        self.lock = threading.Lock()
+
+    def _book(self, mid):
+        return {
+            "BUY": {round(mid - TICK * (i + 1), 2): round(self.random.uniform(10, 500), 2) for i in range(LEVELS)},
+            "SELL": {round(mid + TICK * (i + 1), 2): round(self.random.uniform(10, 500), 2) for i in range(LEVELS)},
+        }
+
+    def ensure(self, token_id):
+        with self.lock:
+            if token_id not in self.books:
+                self.mids[token_id] = 0.5
+                self.books[token_id] = self._book(0.5)
+
+    def snapshot(self, token_id):
+        """The token's book in the REST/WebSocket "book" format."""
+        self.ensure(token_id)
+        with self.lock:
+            book = self.books[token_id]
+            return {
+                "event_type": "book",
+                "asset_id": token_id,
+                "bids": [{"price": f"{p:.2f}", "size": f"{s:.2f}"} for p, s in sorted(book["BUY"].items())],
+                "asks": [{"price": f"{p:.2f}", "size": f"{s:.2f}"} for p, s in sorted(book["SELL"].items(), reverse=True)],
+                "timestamp": str(int(time.time() * 1000)),
+            }
+
+    def step(self, token_ids):
+        """Move every non-static token's mid by up to one tick; return the feed messages."""
+        changes = []
+        trades = []
+        now = str(int(time.time() * 1000))
+        with self.lock:
+            for token_id in token_ids:
+                if token_id in self.static:
+                    continue
+                mid = self.mids[token_id]
+                mid = round(min(0.95, max(0.05, mid + self.random.choice((-TICK, 0, TICK)))), 2)
+                self.mids[token_id] = mid
+                old, new = self.books[token_id], self._book(mid)
+                for side in ("BUY", "SELL"):
+                    for price in old[side].keys() - new[side].keys():
+                        changes.append({"asset_id": token_id, "price": f"{price:.2f}", "size": "0", "side": side})
+                    for price, size in new[side].items():
+                        changes.append({"asset_id": token_id, "price": f"{price:.2f}", "size": f"{size:.2f}",
+                                        "side": side})
+                self.books[token_id] = new
+                if self.random.random() < 0.3:
+                    trades.append({"event_type": "last_trade_price", "asset_id": token_id,
+                                   "price": f"{mid:.2f}", "timestamp": now})
+        messages = [{"event_type": "price_change", "price_changes": changes, "timestamp": now}] if changes else []
+        return messages + trades
+
+def make_http_handler(feed):
+    class BookHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            parts = urlsplit(self.path)
+            token_id = parse_qs(parts.query).get("token_id", [None])[0]
+            if parts.path != "/book" or not token_id:
+                self.send_error(404)
+                return
+            book = feed.snapshot(token_id)
+            # The ETag covers the book, not the timestamp
+            etag = '"' + hashlib.sha256(json.dumps([book["bids"], book["asks"]]).encode()).hexdigest()[:16] + '"'
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.end_headers()
+                return
+            body = json.dumps(book).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("ETag", etag)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return BookHandler
+
+async def serve(feed, ws_port, http_port, tick, host="127.0.0.1", ready=None):
+    """Run the REST and (when available) WebSocket feeds until cancelled."""
+    http_server = ThreadingHTTPServer((host, http_port), make_http_handler(feed))
+    threading.Thread(target=http_server.serve_forever, daemon=True).start()
+    subscribers = {}  # websocket -> subscribed token IDs
+    watched = set()
+
+    async def handler(ws, path=None):
+        try:
+            async for raw in ws:
+                if raw == "PING":
+                    await ws.send("PONG")
+                    continue
+                request = json.loads(raw)
+                token_ids = [str(token_id) for token_id in request.get("assets_ids", [])]
+                subscribers[ws] = set(token_ids)
+                watched.update(token_ids)
+                await ws.send(json.dumps([feed.snapshot(token_id) for token_id in token_ids]))
+        except websockets.exceptions.ConnectionClosed:
+            pass
+        finally:
+            subscribers.pop(ws, None)
+
+    async def ticker():
+        while True:
+            await asyncio.sleep(tick)
+            with feed.lock:
+                tokens = sorted(watched | set(feed.books))
+            if not tokens:
+                continue
+            messages = feed.step(tokens)
+            for ws, token_ids in list(subscribers.items()):
+                mine = []
+                for message in messages:
+                    if message["event_type"] == "price_change":
+                        changes = [c for c in message["price_changes"] if c["asset_id"] in token_ids]
+                        if changes:
+                            mine.append(dict(message, price_changes=changes))
+                    elif message["asset_id"] in token_ids:
+                        mine.append(message)
+                if mine:
+                    try:
+                        await ws.send(json.dumps(mine))
+                    except websockets.exceptions.ConnectionClosed:
+                        subscribers.pop(ws, None)
+
+    ws_server = await websockets.serve(handler, host, ws_port) if websockets else None
+    if ready:
+        ready.set()
+    try:
+        await ticker()
+    finally:
+        if ws_server:
+            ws_server.close()
+        http_server.shutdown()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve a fake Polymarket price feed locally")
+    parser.add_argument("--ws-port", type=int, default=8765, help="WebSocket port (default: 8765)")
+    parser.add_argument("--http-port", type=int, default=8766, help="REST port (default: 8766)")
+    parser.add_argument("--tick", type=float, default=0.2, help="seconds between price moves (default: 0.2)")
+    parser.add_argument("--seed", type=int, help="random seed for a repeatable feed")
+    parser.add_argument("--static", nargs="+", default=[], metavar="TOKEN",
+                        help="token IDs whose book never moves, so polling them gets 304s "
+                             "(default: none)")
+    args = parser.parse_args(argv)
+
+    if websockets is None:
+        print("⚠️  websockets not installed: serving REST only (pip install websockets)")
+    else:
+        print(f"🔌 WebSocket: ws://127.0.0.1:{args.ws_port}")
+    print(f"🌐 REST:      http://127.0.0.1:{args.http_port}/book?token_id=<id>")
+    try:
+        asyncio.run(serve(MockFeed(args.seed, args.static), args.ws_port, args.http_port, args.tick))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""
+Streaming Polymarket price monitor
+
+Keeps a live order-book/price table for a set of outcome token IDs from
+the CLOB market WebSocket, falling back to polling the REST /book endpoint
+with ETags (If-None-Match) when websockets is not installed or the socket
+keeps failing. Threshold alerts fire from the message handler itself, so
+a crossing is reported as soon as the update arrives.
+
+Usage:
+  python3 price_monitor.py <token-id> [<token-id> ...] --below <token-id>=0.60 --above <token-id>=0.85
+  python3 price_monitor.py <token-id> --poll --interval 0.5 --duration 300
+
+Try it offline against the bundled stand-in feed:
+  python3 mock_price_feed.py --static 102 &
+  python3 price_monitor.py 101 102 --ws-url ws://127.0.0.1:8765 --rest-url http://127.0.0.1:8766 \\
+      --above 101=0.55 --below 101=0.45
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import websockets
+except ImportError:  # optional: pip install websockets
+    websockets = None
+
+import requests
+
+from gamma_client import USER_AGENT, backoff_delay
+
+WS_URL = "wss://ws-subscriptions-clob.polymarket.com/ws/market"
+REST_URL = "https://clob.polymarket.com"
+
+PING_INTERVAL = 10  # seconds; the market channel expects a text PING
+POLL_INTERVAL = 1.0
+WS_MAX_FAILURES = 3  # consecutive failed connects before polling instead
+
+FIELDS = ("mid", "bid", "ask", "last")
+
+class Quote:
+    """Order book and last trade for one token."""
+
+    __slots__ = ("bids", "asks", "last", "updated", "received")
+
+    def __init__(self):
+        self.bids = {}  # price -> size
+        self.asks = {}
+        self.last = None
+        self.updated = None   # feed timestamp (seconds), when it sends one
+        self.received = None  # local monotonic time of the last update
+
+    @property
+    def bid(self):
+        return max(self.bids) if self.bids else None
+
+    @property
+    def ask(self):
+        return min(self.asks) if self.asks else None
+
+    @property
+    def mid(self):
+        bid, ask = self.bid, self.ask
+        if bid is not None and ask is not None:
+            return (bid + ask) / 2
+        return self.last
+
+    def set_book(self, bids, asks):
+        self.bids = {float(level["price"]): float(level["size"]) for level in bids}
+        self.asks = {float(level["price"]): float(level["size"]) for level in asks}
+
+    def set_level(self, side, price, size):
+        book = self.bids if side.upper() == "BUY" else self.asks
+        price, size = float(price), float(size)
+        if size:
+            book[price] = size
+        else:
+            book.pop(price, None)
+
+class Alert:
+    """Edge-triggered threshold on one field of a token's quote.
+
+    Fires once when the value crosses above/below its level, and re-arms
+    when the value moves back across it.
+    """
+
+    def __init__(self, token_id, callback, above=None, below=None, field="mid"):
+        if field not in FIELDS:
+            raise ValueError(f"field must be one of {', '.join(FIELDS)}")
+        self.token_id = token_id
+        self.callback = callback
+        self.above = above
+        self.below = below
+        self.field = field
+        self.fired_above = False
+        self.fired_below = False
+
+    def check(self, quote):
+        value = getattr(quote, self.field)
+        if value is None:
+            return
+        if self.above is not None:
+            if value >= self.above and not self.fired_above:
+                self.fired_above = True
+                self.callback(self, "above", value, quote)
+            elif value < self.above:
+                self.fired_above = False
+        if self.below is not None:
+            if value <= self.below and not self.fired_below:
+                self.fired_below = True
+                self.callback(self, "below", value, quote)
+            elif value > self.below:
+                self.fired_below = False
+
+class PriceMonitor:
+    """Live price table for a set of token IDs, with threshold alerts."""
+
+    def __init__(self, token_ids, ws_url=WS_URL, rest_url=REST_URL, poll_interval=POLL_INTERVAL,
+                 use_websocket=True):
+        self.token_ids = list(dict.fromkeys(str(token_id) for token_id in token_ids))
+        self.ws_url = ws_url
+        self.rest_url = rest_url.rstrip("/")
+        self.poll_interval = poll_interval
+        self.use_websocket = use_websocket and websockets is not None
+        self.quotes = {token_id: Quote() for token_id in self.token_ids}
+        self.alerts = []
+        self.mode = None  # "websocket" or "poll" while running
+        self.messages = 0
+
+    def add_alert(self, token_id, callback, above=None, below=None, field="mid"):
+        alert = Alert(str(token_id), callback, above, below, field)
+        self.alerts.append(alert)
+        return alert
+
+    def apply(self, message):
+        """Apply one feed message (or a list of them) to the price table.
+
+        Understands the market channel's book, price_change and
+        last_trade_price events. Returns the token IDs that changed.
+        """
+        if isinstance(message, list):
+            changed = set()
+            for item in message:
+                changed |= self.apply(item)
+            return changed
+        kind = message.get("event_type")
+        changed = set()
+        if kind == "book":
+            quote = self.quotes.get(message.get("asset_id"))
+            if quote is not None:
+                quote.set_book(message.get("bids", []), message.get("asks", []))
+                changed.add(message["asset_id"])
+        elif kind == "price_change":
+            # Newer feeds batch changes per asset; older ones send one asset per message
+            for change in message.get("price_changes") or [dict(c, asset_id=message.get("asset_id"))
+                                                           for c in message.get("changes", [])]:
+                quote = self.quotes.get(change.get("asset_id"))
+                if quote is not None:
+                    quote.set_level(change["side"], change["price"], change["size"])
+                    changed.add(change["asset_id"])
+        elif kind == "last_trade_price":
+            quote = self.quotes.get(message.get("asset_id"))
+            if quote is not None:
+                quote.last = float(message["price"])
+                changed.add(message["asset_id"])
+
+        now = time.monotonic()
+        stamp = message.get("timestamp")
+        for token_id in changed:
+            quote = self.quotes[token_id]
+            quote.received = now
+            if stamp:
+                quote.updated = float(stamp) / 1000
+            for alert in self.alerts:
+                if alert.token_id == token_id:
+                    alert.check(quote)
+        self.messages += 1
+        return changed
+
+    async def _websocket(self, stop):
+        """Stream from the market channel until stop is set; reconnect on errors."""
+        failures = 0
+        while not stop.is_set():
+            try:
+                async with websockets.connect(self.ws_url, ping_interval=None) as ws:
+                    failures = 0
+                    self.mode = "websocket"
+                    await ws.send(json.dumps({"assets_ids": self.token_ids, "type": "market"}))
+                    next_ping = time.monotonic() + PING_INTERVAL
+                    while not stop.is_set():
+                        try:
+                            raw = await asyncio.wait_for(ws.recv(), timeout=max(0.1, next_ping - time.monotonic()))
+                        except asyncio.TimeoutError:
+                            await ws.send("PING")
+                            next_ping = time.monotonic() + PING_INTERVAL
+                            continue
+                        if raw == "PONG":
+                            continue
+                        try:
+                            self.apply(json.loads(raw))
+                        except (ValueError, KeyError, TypeError) as e:
+                            print(f"⚠️  Skipped malformed message: {e}", file=sys.stderr)
+            except (OSError, asyncio.TimeoutError, websockets.exceptions.WebSocketException) as e:
+                failures += 1
+                if failures >= WS_MAX_FAILURES:
+                    print(f"⚠️  WebSocket unavailable ({e}); polling instead", file=sys.stderr)
+                    return False
+                await asyncio.sleep(backoff_delay(failures))
+        return True
+
+    async def _poll(self, stop):
+        """Poll /book for every token each interval, skipping unchanged books via ETags."""
+        self.mode = "poll"
+        session = requests.Session()
+        session.headers["User-Agent"] = USER_AGENT
+        etags = {}
+
+        def fetch(token_id):
+            headers = {"If-None-Match": etags[token_id]} if token_id in etags else {}
+            resp = session.get(f"{self.rest_url}/book", params={"token_id": token_id},
+                               headers=headers, timeout=(3, 10))
+            if resp.status_code == 304:
+                return None
+            resp.raise_for_status()
+            if resp.headers.get("ETag"):
+                etags[token_id] = resp.headers["ETag"]
+            return resp.json()
+
+        executor = ThreadPoolExecutor(max_workers=min(16, len(self.token_ids)))
+        loop = asyncio.get_running_loop()
+        try:
+            while not stop.is_set():
+                started = time.monotonic()
+                results = await asyncio.gather(*(loop.run_in_executor(executor, fetch, token_id)
+                                                 for token_id in self.token_ids),
+                                               return_exceptions=True)
+                for token_id, book in zip(self.token_ids, results):
+                    if isinstance(book, Exception):
+                        print(f"⚠️  {token_id}: {book}", file=sys.stderr)
+                    elif book is not None:
+                        self.apply(dict(book, event_type="book", asset_id=token_id))
+                try:
+                    await asyncio.wait_for(stop.wait(),
+                                           timeout=max(0, self.poll_interval - (time.monotonic() - started)))
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            executor.shutdown(wait=False)
+            session.close()
+
+    async def run(self, duration=None, stop=None):
+        """Monitor until duration seconds pass or stop (an asyncio.Event) is set."""
+        stop = stop or asyncio.Event()
+        if duration:
+            asyncio.get_running_loop().call_later(duration, stop.set)
+        if self.use_websocket and await self._websocket(stop):
+            return
+        await self._poll(stop)
+
+def parse_threshold(text):
+    """'TOKEN=PRICE' -> (token, price)"""
+    token_id, _, price = text.rpartition("=")
+    if not token_id:
+        raise argparse.ArgumentTypeError(f"expected TOKEN=PRICE, got {text!r}")
+    return token_id, float(price)
+
+def format_price(value):
+    return f"{value * 100:5.1f}¢" if value is not None else "   - "
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Monitor live Polymarket prices and alert on thresholds")
+    parser.add_argument("token_ids", nargs="+", help="outcome token IDs (clobTokenIds)")
+    parser.add_argument("--above", type=parse_threshold, action="append", default=[], metavar="TOKEN=PRICE",
+                        help="alert when the price rises to PRICE (0-1); repeatable")
+    parser.add_argument("--below", type=parse_threshold, action="append", default=[], metavar="TOKEN=PRICE",
+                        help="alert when the price falls to PRICE (0-1); repeatable")
+    parser.add_argument("--field", choices=FIELDS, default="mid", help="price to watch (default: mid)")
+    parser.add_argument("--duration", type=float, help="stop after N seconds (default: run until Ctrl-C)")
+    parser.add_argument("--poll", action="store_true", help="poll the REST API instead of the WebSocket")
+    parser.add_argument("--interval", type=float, default=POLL_INTERVAL,
+                        help=f"seconds between polls (default: {POLL_INTERVAL:g})")
+    parser.add_argument("--status", type=float, default=10, metavar="SECONDS",
+                        help="print the price table every N seconds (0 = never, default: 10)")
+    parser.add_argument("--ws-url", default=WS_URL, help="market channel WebSocket URL")
+    parser.add_argument("--rest-url", default=REST_URL, help="CLOB REST base URL for polling")
+    args = parser.parse_args(argv)
+
+    monitor = PriceMonitor(args.token_ids, ws_url=args.ws_url, rest_url=args.rest_url,
+                           poll_interval=args.interval, use_websocket=not args.poll)
+    if not args.poll and websockets is None:
+        print("⚠️  websockets not installed: polling instead (pip install websockets)", file=sys.stderr)
+
+    def on_alert(alert, direction, value, quote):
+        level = alert.above if direction == "above" else alert.below
+        arrow = "📈" if direction == "above" else "📉"
+        latency = ""
+        if quote.updated:
+            latency = f" ({(time.time() - quote.updated) * 1000:.0f} ms after the feed)"
+        print(f"{arrow} {time.strftime('%H:%M:%S')} {alert.token_id} {alert.field} "
+              f"{format_price(value)} crossed {direction} {format_price(level)}{latency}", flush=True)
+
+    for token_id, price in args.above:
+        monitor.add_alert(token_id, on_alert, above=price, field=args.field)
+    for token_id, price in args.below:
+        monitor.add_alert(token_id, on_alert, below=price, field=args.field)
+
+    async def status():
+        while args.status:
+            await asyncio.sleep(args.status)
+            print(f"\n📊 {time.strftime('%H:%M:%S')} [{monitor.mode}, {monitor.messages} updates]")
+            for token_id, quote in monitor.quotes.items():
+                print(f"   {token_id[:20]:20s} bid {format_price(quote.bid)}  ask {format_price(quote.ask)}  "
+                      f"mid {format_price(quote.mid)}  last {format_price(quote.last)}")
+
+    async def run():
+        reporter = asyncio.ensure_future(status())
+        try:
+            await monitor.run(duration=args.duration)
+        finally:
+            reporter.cancel()
+
+    print(f"👀 Monitoring {len(monitor.token_ids)} token(s)")
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+    print(f"✅ Stopped after {monitor.messages} update(s)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,16 +3,228 @@
 Publish blog posts from content/blog/ to docs/blog/
 """
 
+import argparse
+import html
+import json
 import os
+import re
 import sys
+from functools import lru_cache
 from pathlib import Path
 from datetime import datetime
-import re
+
+# Shared rendering core lives in sitegen/ at the repository root
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+from sitegen import parse_front_matter, render_document, render_markdown
+from sitegen.assets import fingerprinted_name, minify_css, write_fingerprinted, write_if_changed
+from sitegen.feeds import atom_feed, json_feed
+from sitegen.manifest import hash_bytes, hash_file, hash_sources, is_fresh, load_manifest, save_manifest
+from sitegen.minify import format_savings, minify_html
+from sitegen.parallel import map_files
+from sitegen.profiling import PROFILER, span
+from sitegen.search import WIDGET_NAME
 
 # Paths
 CONTENT_DIR = Path("content/blog")
 OUTPUT_DIR = Path("docs/blog")
 
+# Incremental publish manifest, kept next to the published posts
+MANIFEST_NAME = ".publish-manifest.json"
+MANIFEST_VERSION = 2
+
+# Posts per blog index, category and month listing page
+POSTS_PER_PAGE = 10
+
+# Public site address (feeds need absolute URLs) and latest posts per feed
+SITE_URL = "https://duet-company.github.io"
+FEED_SIZE = 20
+
+# Category for posts whose front matter does not name one
+DEFAULT_CATEGORY = "Engineering"
+
+# Dated post file names: YYYY-MM-DD-slug.md
+FILENAME_DATE_RE = re.compile(r"^(\d{4}-\d{2}-\d{2})(?:-|$)")
+
+# Blog stylesheet, published once as a fingerprinted blog.<hash>.css
+BLOG_CSS = """* { margin: 0; padding: 0; box-sizing: border-box; }
+:root {
+    --bg-primary: #0f172a;
+    --bg-secondary: #1e293b;
+    --bg-elevated: #334155;
+    --text-primary: #f1f5f9;
+    --text-secondary: #cbd5e1;
+    --text-muted: #64748b;
+    --accent: #10b981;
+    --accent-dark: #059669;
+    --border: #334155;
+    --border-subtle: #1e293b;
+    --code-bg: #1a1a2e;
+    --code-text: #a5b4fc;
+}
+body {
+    font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', 'Inter', system-ui, sans-serif;
+    background: var(--bg-primary);
+    color: var(--text-primary);
+    line-height: 1.7;
+    min-height: 100vh;
+}
+.container {
+    max-width: 900px;
+    margin: 0 auto;
+    padding: 60px 20px;
+}
+header {
+    text-align: center;
+    padding: 60px 0;
+    border-bottom: 1px solid var(--border);
+    background: linear-gradient(135deg, var(--accent), var(--accent-dark));
+    -webkit-background-clip: text;
+    -webkit-text-fill-color: transparent;
+    background-clip: text;
+}
+h1 {
+    font-size: 2.5rem;
+    font-weight: 700;
+    margin-bottom: 12px;
+}
+.meta {
+    color: var(--text-muted);
+    font-size: 0.95rem;
+    margin-top: 8px;
+}
+.meta span {
+    display: inline-block;
+    margin: 0 12px;
+}
+.content {
+    padding: 40px 0;
+}
+.content h2 {
+    font-size: 1.8rem;
+    margin: 40px 0 20px;
+    color: var(--accent);
+}
+.content h3 {
+    font-size: 1.4rem;
+    margin: 30px 0 16px;
+}
+.content p {
+    margin-bottom: 16px;
+    line-height: 1.8;
+}
+.content pre {
+    background: var(--code-bg);
+    padding: 20px;
+    border-radius: 8px;
+    overflow-x: auto;
+    margin: 20px 0;
+    border: 1px solid var(--border);
+}
+.content code {
+    color: var(--code-text);
+    font-family: 'SF Mono', 'Menlo', monospace;
+    font-size: 0.9rem;
+}
+.content ul, .content ol {
+    margin: 16px 0;
+    padding-left: 24px;
+}
+.content li {
+    margin-bottom: 8px;
+}
+.content blockquote {
+    border-left: 4px solid var(--accent);
+    margin: 20px 0;
+    padding: 16px 20px;
+    background: var(--bg-secondary);
+    border-radius: 0 8px 8px 0;
+}
+.content table {
+    width: 100%;
+    border-collapse: collapse;
+    margin: 24px 0;
+}
+.content th, .content td {
+    padding: 12px 16px;
+    text-align: left;
+    border-bottom: 1px solid var(--border);
+}
+.content th {
+    background: var(--bg-secondary);
+    font-weight: 600;
+    color: var(--accent);
+}
+.post-list {
+    padding: 40px 0;
+}
+.post-summary {
+    padding: 24px 0;
+    border-bottom: 1px solid var(--border-subtle);
+}
+.post-summary h2 {
+    font-size: 1.5rem;
+    margin-bottom: 4px;
+}
+.post-summary h2 a {
+    color: var(--text-primary);
+    text-decoration: none;
+}
+.post-summary h2 a:hover {
+    color: var(--accent);
+}
+.post-summary .meta span:first-child {
+    margin-left: 0;
+}
+.post-summary p {
+    color: var(--text-secondary);
+    margin-top: 8px;
+}
+.pagination, .archives {
+    display: flex;
+    flex-wrap: wrap;
+    gap: 12px 20px;
+    margin-top: 32px;
+    color: var(--text-muted);
+}
+.pagination a, .archives a {
+    color: var(--accent);
+    text-decoration: none;
+}
+.archives h3 {
+    width: 100%;
+    font-size: 1rem;
+    color: var(--text-secondary);
+}
+.footer {
+    margin-top: 60px;
+    padding-top: 40px;
+    border-top: 1px solid var(--border);
+    text-align: center;
+    color: var(--text-muted);
+}
+.footer a {
+    color: var(--accent);
+    text-decoration: none;
+}
+.footer a:hover {
+    text-decoration: underline;
+}
+@media (max-width: 768px) {
+    .container {
+        padding: 40px 16px;
+    }
+    h1 {
+        font-size: 2rem;
+    }
+    .content h2 {
+        font-size: 1.5rem;
+    }
+}
+"""
+BLOG_STYLESHEET = minify_css(BLOG_CSS)
+BLOG_CSS_NAME = fingerprinted_name("blog", ".css", BLOG_STYLESHEET)
+
 # Blog post template
 BLOG_TEMPLATE = """<!DOCTYPE html>
 <html lang="en">
@@ -21,141 +233,10 @@ BLOG_TEMPLATE = """<!DOCTYPE html>
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>{title} - Duet Company Blog</title>
     <meta name="description" content="{description}">
-    <style>
-        * {{ margin: 0; padding: 0; box-sizing: border-box; }}
-        :root {{
-            --bg-primary: #0f172a;
-            --bg-secondary: #1e293b;
-            --bg-elevated: #334155;
-            --text-primary: #f1f5f9;
-            --text-secondary: #cbd5e1;
-            --text-muted: #64748b;
-            --accent: #10b981;
-            --accent-dark: #059669;
-            --border: #334155;
-            --border-subtle: #1e293b;
-            --code-bg: #1a1a2e;
-            --code-text: #a5b4fc;
-        }}
-        body {{
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', 'Inter', system-ui, sans-serif;
-            background: var(--bg-primary);
-            color: var(--text-primary);
-            line-height: 1.7;
-            min-height: 100vh;
-        }}
-        .container {{
-            max-width: 900px;
-            margin: 0 auto;
-            padding: 60px 20px;
-        }}
-        header {{
-            text-align: center;
-            padding: 60px 0;
-            border-bottom: 1px solid var(--border);
-            background: linear-gradient(135deg, var(--accent), var(--accent-dark));
-            -webkit-background-clip: text;
-            -webkit-text-fill-color: transparent;
-            background-clip: text;
-        }}
-        h1 {{
-            font-size: 2.5rem;
-            font-weight: 700;
-            margin-bottom: 12px;
-        }}
-        .meta {{
-            color: var(--text-muted);
-            font-size: 0.95rem;
-            margin-top: 8px;
-        }}
-        .meta span {{
-            display: inline-block;
-            margin: 0 12px;
-        }}
-        .content {{
-            padding: 40px 0;
-        }}
-        .content h2 {{
-            font-size: 1.8rem;
-            margin: 40px 0 20px;
-            color: var(--accent);
-        }}
-        .content h3 {{
-            font-size: 1.4rem;
-            margin: 30px 0 16px;
-        }}
-        .content p {{
-            margin-bottom: 16px;
-            line-height: 1.8;
-        }}
-        .content pre {{
-            background: var(--code-bg);
-            padding: 20px;
-            border-radius: 8px;
-            overflow-x: auto;
-            margin: 20px 0;
-            border: 1px solid var(--border);
-        }}
-        .content code {{
-            color: var(--code-text);
-            font-family: 'SF Mono', 'Menlo', monospace;
-            font-size: 0.9rem;
-        }}
-        .content ul, .content ol {{
-            margin: 16px 0;
-            padding-left: 24px;
-        }}
-        .content li {{
-            margin-bottom: 8px;
-        }}
-        .content blockquote {{
-            border-left: 4px solid var(--accent);
-            margin: 20px 0;
-            padding: 16px 20px;
-            background: var(--bg-secondary);
-            border-radius: 0 8px 8px 0;
-        }}
-        .content table {{
-            width: 100%;
-            border-collapse: collapse;
-            margin: 24px 0;
-        }}
-        .content th, .content td {{
-            padding: 12px 16px;
-            text-align: left;
-            border-bottom: 1px solid var(--border);
-        }}
-        .content th {{
-            background: var(--bg-secondary);
-            font-weight: 600;
-            color: var(--accent);
-        }}
-        .footer {{
-            margin-top: 60px;
-            padding-top: 40px;
-            border-top: 1px solid var(--border);
-            text-align: center;
-            color: var(--text-muted);
-        }}
-        .footer a {{
-            color: var(--accent);
-            text-decoration: none;
-        }}
-        .footer a:hover {{
-            text-decoration: underline;
-        }}
-        @media (max-width: 768px) {{
-            .container {{
-                padding: 40px 16px;
-            }}
-            h1 {{
-                font-size: 2rem;
-            }}
-            .content h2 {{
-                font-size: 1.5rem;
-            }}
-        }}
-    </style>
+    <link rel="stylesheet" href="{stylesheet}">
+    <link rel="alternate" type="application/atom+xml" title="Duet Company Blog" href="feed.xml">
+    <link rel="alternate" type="application/feed+json" title="Duet Company Blog" href="feed.json">
+    <script src="/{search_js}" defer></script>
 </head>
 <body>
     <header>
@@ -172,6 +253,45 @@ BLOG_TEMPLATE = """<!DOCTYPE html>
         <article class="content">
             {body}
         </article>
+        <footer class="footer">
+            <p>© 2026 Duet Company. AI-first data infrastructure.</p>
+            <p>
+                <a href="index.html">← All posts</a> · <a href="../index.html">Home</a>
+            </p>
+        </footer>
+    </div>
+</body>
+</html>
+"""
+
+# Blog index, category and month listing template
+BLOG_INDEX_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{title} - Duet Company Blog</title>
+    <meta name="description" content="{description}">
+    <link rel="stylesheet" href="{stylesheet}">
+    <link rel="alternate" type="application/atom+xml" title="Duet Company Blog" href="feed.xml">
+    <link rel="alternate" type="application/feed+json" title="Duet Company Blog" href="feed.json">
+    <script src="/{search_js}" defer></script>
+</head>
+<body>
+    <header>
+        <div class="container">
+            <h1>{title}</h1>
+            <div class="meta">
+                <span>{summary}</span>
+            </div>
+        </div>
+    </header>
+    <div class="container">
+        <section class="post-list" data-search-ignore>
+{posts}
+        </section>
+{pagination}
+{archives}
         <footer class="footer">
             <p>© 2026 Duet Company. AI-first data infrastructure.</p>
             <p>
@@ -183,82 +303,59 @@ BLOG_TEMPLATE = """<!DOCTYPE html>
 </html>
 """
 
-def markdown_to_html(markdown_text):
-    """Simple Markdown to HTML converter"""
-    html = markdown_text
-
-    # Headers
-    html = re.sub(r'^### (.+)$', r'<h3>\1</h3>', html, flags=re.MULTILINE)
-    html = re.sub(r'^## (.+)$', r'<h2>\1</h2>', html, flags=re.MULTILINE)
-    html = re.sub(r'^# (.+)$', r'<h1>\1</h1>', html, flags=re.MULTILINE)
-
-    # Code blocks
-    html = re.sub(r'```(\w+)?\n(.*?)```', r'<pre><code>\2</code></pre>', html, flags=re.DOTALL)
-
-    # Inline code
-    html = re.sub(r'`([^`]+)`', r'<code>\1</code>', html)
-
-    # Bold
-    html = re.sub(r'\*\*([^*]+)\*\*', r'<strong>\1</strong>', html)
-
-    # Italic
-    html = re.sub(r'\*([^*]+)\*', r'<em>\1</em>', html)
-
-    # Lists
-    lines = html.split('\n')
-    in_list = False
-    list_type = None
-    result = []
-
-    for line in lines:
-        if line.startswith('- '):
-            if not in_list:
-                result.append('<ul>')
-                in_list = True
-                list_type = 'ul'
-            result.append(f'<li>{line[2:]}</li>')
-        elif line.strip() == '' and in_list:
-            result.append('</ul>')
-            in_list = False
-            list_type = None
-            result.append(line)
-        else:
-            if in_list:
-                result.append('</ul>')
-                in_list = False
-                list_type = None
-            result.append(line)
-
-    if in_list:
-        result.append('</ul>')
-
-    html = '\n'.join(result)
-
-    # Paragraphs (skip if already wrapped in HTML tags)
-    paragraphs = html.split('\n\n')
-    result = []
-    for para in paragraphs:
-        para = para.strip()
-        if para and not para.startswith('<'):
-            result.append(f'<p>{para}</p>')
-        elif para:
-            result.append(para)
-
-    return '\n\n'.join(result)
-
-def extract_metadata(content):
-    """Extract title, date, and other metadata from markdown"""
-    lines = content.split('\n')
-
-    title = "Blog Post"
-    date = datetime.now().strftime("%B %d, %Y")
-    category = "Engineering"
+# One post in a listing page
+POST_SUMMARY_TEMPLATE = """            <article class="post-summary">
+                <h2><a href="{url}">{title}</a></h2>
+                <div class="meta">
+                    <span>📅 {date}</span>
+                    <span>⏱️ {read_time}</span>
+                    <span>🏷️ <a href="{category_url}">{category}</a></span>
+                </div>
+                <p>{description}</p>
+            </article>"""
 
+def markdown_to_html(markdown_text):
+    """Convert Markdown to HTML with the shared sitegen engine"""
+    return render_markdown(markdown_text)
+
+def parse_date(value, source):
+    """Parse a front matter or file name date into a datetime"""
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f"invalid date {value!r} in {source}") from None
+
+@lru_cache(maxsize=1024)
+def extract_metadata(content, filename=""):
+    """Extract title, date, and other metadata from markdown
+
+    Front matter fields win; otherwise the title comes from a leading
+    '# ' heading and the date from a YYYY-MM-DD-slug.md file name. Posts
+    with neither date are rejected so output never depends on the clock.
+    Results are cached per (content, filename).
+    """
+    fields, body = parse_front_matter(content)
+    lines = body.lstrip("\n").split("\n")
+
+    title = fields.get("title", "Blog Post")
+    category = fields.get("category") or DEFAULT_CATEGORY
+
+    # A leading heading repeats the title shown in the post header
     if lines[0].startswith('# '):
-        title = lines[0][2:].strip()
-        content = '\n'.join(lines[1:])
+        title = fields.get("title") or lines[0][2:].strip()
+        lines = lines[1:]
+    body = '\n'.join(lines)
 
-    return title, date, category, content
+    if fields.get("date"):
+        date = parse_date(fields["date"], f"{filename or 'post'} front matter")
+    else:
+        match = FILENAME_DATE_RE.match(Path(filename).stem)
+        if not match:
+            raise ValueError(f"no date for {filename or 'post'}: add 'date:' front matter "
+                             f"or name the file YYYY-MM-DD-slug.md")
+        date = parse_date(match.group(1), filename)
+
+    return title, date.strftime("%B %d, %Y"), category, body
 
 def calculate_read_time(content):
     """Calculate estimated read time (assuming 200 words per minute)"""
@@ -266,60 +363,330 @@ def calculate_read_time(content):
     minutes = max(1, round(word_count / 200))
     return f"{minutes} min read"
 
-def publish_blog_posts():
-    """Publish all blog posts from content/blog/ to docs/blog/"""
+def render_post(blog_file):
+    """Render one blog post file to a complete HTML document"""
+    return render_post_entry(blog_file)[0]
+
+def render_post_entry(blog_file):
+    """Render one blog post; return its HTML and its listing metadata"""
+    with span(blog_file.name, 'file'):
+        return _render_post(blog_file)
+
+def _render_post(blog_file):
+    # Read markdown content
+    with span('read'):
+        with open(blog_file, 'r', encoding='utf-8') as f:
+            markdown_content = f.read()
+
+    # Extract metadata
+    with span('extract_metadata'):
+        title, date, category, body = extract_metadata(markdown_content, blog_file.name)
+
+        # Calculate read time
+        read_time = calculate_read_time(body)
+
+        # Generate description (first 150 chars of body)
+        description = body.replace('#', '').strip()[:150] + "..."
+
+    # Listing metadata, cached in the manifest so index pages never re-read posts
+    metadata = {
+        "url": f"{blog_file.stem}.html",
+        "title": title,
+        "date": date,
+        "date_iso": datetime.strptime(date, "%B %d, %Y").strftime("%Y-%m-%d"),
+        "category": category,
+        "read_time": read_time,
+        "description": description,
+    }
+
+    # Render markdown into the blog template
+    return render_document(
+        body,
+        BLOG_TEMPLATE,
+        title=title,
+        description=description,
+        date=date,
+        read_time=read_time,
+        category=category,
+        stylesheet=BLOG_CSS_NAME,
+        search_js=WIDGET_NAME
+    ), metadata
+
+def slugify(text):
+    """Lowercase, hyphen-separated form of text for file names"""
+    return re.sub(r"[^a-z0-9]+", "-", text.lower()).strip("-") or "misc"
+
+def listing_name(base, page):
+    """File name of page N (1-based) of a listing"""
+    return f"{base}.html" if page == 1 else f"{base}-page-{page}.html"
+
+def month_label(month):
+    """'2026-02' -> 'February 2026'"""
+    return datetime.strptime(month, "%Y-%m").strftime("%B %Y")
+
+def render_archive_links(categories, months):
+    """Links to every category and month archive"""
+    lines = ['        <nav class="archives">', "            <h3>Categories</h3>"]
+    for category in sorted(categories):
+        count = len(categories[category])
+        lines.append(f'            <a href="{listing_name("category-" + slugify(category), 1)}">'
+                     f"{html.escape(category)} ({count})</a>")
+    lines.append("            <h3>Archive</h3>")
+    for month in sorted(months, reverse=True):
+        lines.append(f'            <a href="{listing_name("archive-" + month, 1)}">'
+                     f"{month_label(month)} ({len(months[month])})</a>")
+    lines.append("        </nav>")
+    return "\n".join(lines)
+
+def render_listing(title, base, posts, archives, per_page):
+    """Render every page of one listing; return {file name: html}"""
+    pages = {}
+    page_count = max(1, -(-len(posts) // per_page))
+    for page in range(1, page_count + 1):
+        chunk = posts[(page - 1) * per_page:page * per_page]
+        summaries = "\n".join(POST_SUMMARY_TEMPLATE.format(
+            url=post["url"],
+            title=html.escape(post["title"]),
+            date=post["date"],
+            read_time=post["read_time"],
+            category_url=listing_name("category-" + slugify(post["category"]), 1),
+            category=html.escape(post["category"]),
+            description=html.escape(post["description"]),
+        ) for post in chunk)
+
+        links = []
+        if page > 1:
+            links.append(f'<a href="{listing_name(base, page - 1)}">← Newer</a>')
+        if page_count > 1:
+            links.append(f"<span>Page {page} of {page_count}</span>")
+        if page < page_count:
+            links.append(f'<a href="{listing_name(base, page + 1)}">Older →</a>')
+        pagination = f'        <nav class="pagination">{" ".join(links)}</nav>' if links else ""
+
+        pages[listing_name(base, page)] = BLOG_INDEX_TEMPLATE.format(
+            title=html.escape(title),
+            description=html.escape(f"{title} - posts from the Duet Company engineering blog"),
+            stylesheet=BLOG_CSS_NAME,
+            search_js=WIDGET_NAME,
+            summary=f"{len(posts)} post{'s' if len(posts) != 1 else ''}",
+            posts=summaries,
+            pagination=pagination,
+            archives=archives,
+        )
+    return pages
+
+def build_feeds(posts, feed_size=FEED_SIZE, site_url=SITE_URL):
+    """Render Atom and JSON feeds of the latest feed_size posts"""
+    blog_url = f"{site_url.rstrip('/')}/blog/"
+    entries = [{
+        "url": blog_url + post["url"],
+        "title": post["title"],
+        "date_iso": post["date_iso"],
+        "category": post["category"],
+        "summary": post["description"],
+    } for post in posts[:feed_size]]
+    title = "Duet Company Blog"
+    return {
+        "feed.xml": atom_feed(title, blog_url + "feed.xml", blog_url, entries),
+        "feed.json": json_feed(title, blog_url + "feed.json", blog_url, entries),
+    }
+
+def build_listings(posts, per_page=POSTS_PER_PAGE, feed_size=FEED_SIZE, site_url=SITE_URL):
+    """Render the blog index, category and month archives, index.json and feeds.
+
+    posts is the cached metadata index, newest first; no post is re-read.
+    Returns {file name: contents}.
+    """
+    categories = {}
+    months = {}
+    for post in posts:
+        categories.setdefault(post["category"], []).append(post)
+        months.setdefault(post["date_iso"][:7], []).append(post)
+    archives = render_archive_links(categories, months)
+
+    outputs = render_listing("Blog", "index", posts, archives, per_page)
+    for category, category_posts in categories.items():
+        outputs.update(render_listing(category, "category-" + slugify(category),
+                                      category_posts, archives, per_page))
+    for month, month_posts in months.items():
+        outputs.update(render_listing(month_label(month), "archive-" + month,
+                                      month_posts, archives, per_page))
+    outputs["index.json"] = json.dumps({"posts": posts}, indent=2, sort_keys=True, ensure_ascii=False) + "\n"
+    outputs.update(build_feeds(posts, feed_size, site_url))
+    return outputs
+
+def publish_listings(posts, old_manifest, per_page=POSTS_PER_PAGE, feed_size=FEED_SIZE,
+                     site_url=SITE_URL, minify=False):
+    """Write listing pages for the metadata index, touching only changed files.
+
+    Listing pages the previous publish wrote but this one does not (an
+    emptied category, fewer pages) are removed. Returns the written names.
+    """
+    with span("listings"):
+        outputs = build_listings(posts, per_page, feed_size, site_url)
+        for name, text in outputs.items():
+            if minify and name.endswith(".html"):
+                text = minify_html(text)
+            if write_if_changed(OUTPUT_DIR / name, text):
+                print(f"✅ Wrote listing: {OUTPUT_DIR / name}")
+        for name in old_manifest.get("listings", []):
+            if name not in outputs and (OUTPUT_DIR / name).exists():
+                (OUTPUT_DIR / name).unlink()
+                print(f"🗑️  Removed listing: {OUTPUT_DIR / name}")
+    return sorted(outputs)
+
+def template_hash():
+    """Hash the inputs shared by every post: template, stylesheet, embedded asset names and renderer sources"""
+    sources = hash_sources([Path(__file__).resolve()] + sorted((REPO_ROOT / "sitegen").glob("*.py")))
+    # Posts embed these fingerprinted names; a renamed asset must re-render them
+    assets = [BLOG_CSS_NAME, WIDGET_NAME]
+    return hash_bytes("\0".join([BLOG_TEMPLATE, BLOG_STYLESHEET, *assets, sources]).encode("utf-8"))
+
+def remove_orphans(old_manifest, output_names):
+    """Delete published posts whose source file is gone"""
+    removed = 0
+    for output_name in sorted(old_manifest.get("posts", {})):
+        if output_name in output_names:
+            continue
+        output_file = OUTPUT_DIR / output_name
+        if output_file.exists():
+            output_file.unlink()
+            print(f"🗑️  Removed orphan: {output_file}")
+            removed += 1
+    return removed
+
+def publish_blog_posts(jobs=1, incremental=False, per_page=POSTS_PER_PAGE, feed_size=FEED_SIZE,
+                       site_url=SITE_URL, minify=False):
+    """Publish all blog posts from content/blog/ to docs/blog/
+
+    jobs > 1 renders posts across a process pool (0 uses every core).
+    With incremental=True, posts whose source, template and renderer are
+    unchanged since the last publish (per docs/blog/.publish-manifest.json)
+    are skipped. Outputs of deleted sources are removed either way. The
+    blog index, archives, index.json and the Atom/JSON feeds (latest
+    feed_size posts, linked under site_url) are rebuilt from the cached
+    metadata of every post, per_page posts per listing page. minify=True
+    minifies posts and listing pages and reports the bytes saved.
+    """
 
     # Create output directory if it doesn't exist
     OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
     # Find all markdown files in content/blog/
-    blog_files = list(CONTENT_DIR.glob("*.md"))
+    blog_files = sorted(CONTENT_DIR.glob("*.md"))
 
     if not blog_files:
         print("❌ No blog posts found in content/blog/")
         return 1
 
-    published_count = 0
+    manifest_path = OUTPUT_DIR / MANIFEST_NAME
+    old_manifest = load_manifest(manifest_path, MANIFEST_VERSION)
+    manifest = {"version": MANIFEST_VERSION, "posts": {}, "listings": []}
+    shell_hash = template_hash()
 
+    # Only posts whose inputs changed are rendered
+    to_render = []
     for blog_file in blog_files:
-        print(f"\n📝 Processing: {blog_file.name}")
-
-        # Read markdown content
-        with open(blog_file, 'r', encoding='utf-8') as f:
-            markdown_content = f.read()
+        output_name = f"{blog_file.stem}.html"
+        input_hash = hash_bytes(f"{shell_hash}\0{minify}\0{hash_file(blog_file)}".encode("utf-8"))
+        old_entry = old_manifest.get("posts", {}).get(output_name)
+        if incremental and is_fresh(old_entry, input_hash, OUTPUT_DIR / output_name):
+            manifest["posts"][output_name] = old_entry
+            continue
+        to_render.append((blog_file, output_name, input_hash))
 
-        # Extract metadata
-        title, date, category, body = extract_metadata(markdown_content)
+    results = map_files(render_post_entry, [(blog_file,) for blog_file, _, _ in to_render], jobs=jobs)
 
-        # Convert markdown to HTML
-        html_body = markdown_to_html(body)
+    # Shared stylesheet, written once per content hash
+    css_name, css_written = write_fingerprinted(OUTPUT_DIR, "blog", ".css", BLOG_STYLESHEET)
+    if css_written:
+        print(f"✅ Wrote stylesheet: {OUTPUT_DIR / css_name}")
 
-        # Calculate read time
-        read_time = calculate_read_time(markdown_content)
+    published_count = 0
+    failed_count = 0
+    raw_total = minified_total = 0
 
-        # Generate description (first 150 chars of body)
-        description = body.replace('#', '').strip()[:150] + "..."
+    for (blog_file, output_name, input_hash), (rendered, error) in zip(to_render, results):
+        print(f"\n📝 Processing: {blog_file.name}")
 
-        # Create HTML output
-        html_output = BLOG_TEMPLATE.format(
-            title=title,
-            description=description,
-            date=date,
-            read_time=read_time,
-            category=category,
-            body=html_body
-        )
+        if error:
+            print(f"❌ Failed: {error}")
+            failed_count += 1
+            # Its last published page stays on disk, so keep it listed; the
+            # new input hash differs, so the next run retries the post
+            old_entry = old_manifest.get("posts", {}).get(output_name)
+            if old_entry:
+                manifest["posts"][output_name] = old_entry
+            continue
+        html_output, metadata = rendered
+        if minify:
+            raw_size = len(html_output.encode("utf-8"))
+            with span("minify", file=blog_file.name):
+                html_output = minify_html(html_output)
+            raw_total += raw_size
+            minified_total += len(html_output.encode("utf-8"))
 
         # Write to output file
-        output_file = OUTPUT_DIR / f"{blog_file.stem}.html"
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(html_output)
+        output_file = OUTPUT_DIR / output_name
+        with span('write', file=output_file.name):
+            with open(output_file, 'w', encoding='utf-8') as f:
+                f.write(html_output)
+        manifest["posts"][output_name] = {
+            "source": blog_file.name,
+            "input": input_hash,
+            "output": hash_file(output_file),
+            "metadata": metadata,
+        }
 
         print(f"✅ Published to: {output_file}")
         published_count += 1
 
+    remove_orphans(old_manifest, {f"{blog_file.stem}.html" for blog_file in blog_files})
+
+    # Metadata index, newest first, from the manifest rather than the posts
+    posts = sorted((entry["metadata"] for entry in manifest["posts"].values()),
+                   key=lambda post: (post["date_iso"], post["url"]), reverse=True)
+    manifest["listings"] = publish_listings(posts, old_manifest, per_page, feed_size, site_url, minify)
+    save_manifest(manifest_path, manifest)
+
     print(f"\n🎉 Successfully published {published_count} blog post(s) to {OUTPUT_DIR}/")
+    if minified_total:
+        print(f"🗜️  Minified posts: {format_savings(raw_total, minified_total)}")
+    if incremental:
+        print(f"⏭️  Unchanged: {len(blog_files) - len(to_render)}")
+    if failed_count:
+        print(f"❌ {failed_count} blog post(s) failed to render")
+        return 1
     return 0
 
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Publish content/blog/*.md to docs/blog/")
+    parser.add_argument("-j", "--jobs", type=int, default=1,
+                        help="render posts across N processes (0 = all cores, default: 1)")
+    parser.add_argument("--incremental", action="store_true",
+                        help=f"only re-render posts whose inputs changed (tracked in docs/blog/{MANIFEST_NAME})")
+    parser.add_argument("--per-page", type=int, default=POSTS_PER_PAGE, metavar="N",
+                        help=f"posts per index and archive page (default: {POSTS_PER_PAGE})")
+    parser.add_argument("--minify", action="store_true",
+                        help="minify posts and listing pages and report bytes saved")
+    parser.add_argument("--feed-size", type=int, default=FEED_SIZE, metavar="N",
+                        help=f"latest posts in feed.xml and feed.json (default: {FEED_SIZE})")
+    parser.add_argument("--site-url", default=SITE_URL,
+                        help=f"public site address used for feed links (default: {SITE_URL})")
+    parser.add_argument("--profile", nargs="?", const="publish-trace.json", metavar="TRACE",
+                        help="time each phase and post; write a Chrome trace (default: publish-trace.json)")
+    parser.add_argument("--profile-top", type=int, default=10, metavar="N",
+                        help="slowest posts to list in the profile summary (default: 10)")
+    args = parser.parse_args(argv)
+    PROFILER.enabled = bool(args.profile)
+    with span("publish_blog_posts"):
+        status = publish_blog_posts(jobs=args.jobs, incremental=args.incremental, per_page=args.per_page,
+                                    feed_size=args.feed_size, site_url=args.site_url, minify=args.minify)
+    if args.profile:
+        PROFILER.write_trace(args.profile)
+        print(f"\n{PROFILER.summary(args.profile_top)}")
+        print(f"📈 Trace written to {args.profile} (open in https://ui.perfetto.dev)")
+    return status
+
 if __name__ == "__main__":
-    sys.exit(publish_blog_posts())
+    sys.exit(main())
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Batch-resolve Polymarket market slugs to outcome token IDs and prices
+
+Slugs come from the command line, a file (-f) or stdin, and are fetched
+concurrently through the shared Gamma client (pooled session, retries,
+TTL cache) under a concurrency limit and a requests-per-second limit.
+The result is one consolidated JSON document or CSV table.
+
+Usage:
+  python3 resolve-tokens.py <slug> [<slug> ...]
+  python3 resolve-tokens.py -f slugs.txt --format csv -o tokens.csv
+  cat slugs.txt | python3 resolve-tokens.py -j 16 --rate 20
+"""
+
+import argparse
+import asyncio
+import csv
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from gamma_client import GammaClient, RateLimiter, env_options, market_outcomes
+
+DEFAULT_CONCURRENCY = 8
+DEFAULT_RATE = 10.0  # requests per second
+
+CSV_FIELDS = ("slug", "event", "question", "outcome", "token_id", "price")
+
+def read_slugs(args):
+    """Slugs from argv, --file and stdin, in order, without duplicates."""
+    slugs = list(args.slugs)
+    if args.file:
+        stream = sys.stdin if args.file == "-" else open(args.file, "r")
+        with stream:
+            slugs += stream.read().split("\n")
+    elif not slugs and not sys.stdin.isatty():
+        slugs += sys.stdin.read().split("\n")
+    cleaned = (slug.split("#", 1)[0].strip() for slug in slugs)
+    return list(dict.fromkeys(slug for slug in cleaned if slug))
+
+def resolve_event(event):
+    """Event -> {"title", "markets": [{"question", "outcomes": {outcome: {...}}}]}."""
+    markets = []
+    for market in event.get("markets", []):
+        outcomes = {outcome: {"token_id": token_id, "price": price}
+                    for outcome, token_id, price in market_outcomes(market)}
+        if outcomes:
+            markets.append({"question": market.get("question"), "outcomes": outcomes})
+    return {"title": event.get("title"), "markets": markets}
+
+async def resolve_all(client, slugs, concurrency=DEFAULT_CONCURRENCY, rate=DEFAULT_RATE):
+    """Resolve every slug; return ({slug: resolved event}, {slug: error})."""
+    # The client is synchronous (requests), so fetches run on worker threads
+    asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=concurrency))
+    semaphore = asyncio.Semaphore(concurrency)
+    limiter = RateLimiter(rate)
+    resolved = {}
+    errors = {}
+
+    async def resolve(slug):
+        async with semaphore:
+            await limiter.acquire()
+            try:
+                event = await asyncio.to_thread(client.event, slug)
+            except Exception as e:
+                errors[slug] = str(e)
+                return
+        if event is None:
+            errors[slug] = "no event found"
+        else:
+            resolved[slug] = resolve_event(event)
+
+    await asyncio.gather(*(resolve(slug) for slug in slugs))
+    # Report in input order, not completion order
+    return ({slug: resolved[slug] for slug in slugs if slug in resolved},
+            {slug: errors[slug] for slug in slugs if slug in errors})
+
+def write_json(out, resolved, errors):
+    json.dump({"events": resolved, "errors": errors}, out, indent=2, ensure_ascii=False)
+    out.write("\n")
+
+def write_csv(out, resolved):
+    writer = csv.writer(out)
+    writer.writerow(CSV_FIELDS)
+    for slug, event in resolved.items():
+        for market in event["markets"]:
+            for outcome, token in market["outcomes"].items():
+                writer.writerow((slug, event["title"], market["question"], outcome,
+                                 token["token_id"], token["price"]))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Resolve many market slugs to token IDs at once")
+    parser.add_argument("slugs", nargs="*", help="market slugs (default: read from stdin)")
+    parser.add_argument("-f", "--file", help="read slugs from FILE, one per line ('-' for stdin)")
+    parser.add_argument("-j", "--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help=f"requests in flight at once (default: {DEFAULT_CONCURRENCY})")
+    parser.add_argument("--rate", type=float, default=DEFAULT_RATE,
+                        help=f"max requests per second, 0 = no limit; client retries are not "
+                             f"counted (default: {DEFAULT_RATE:g})")
+    parser.add_argument("--format", choices=("json", "csv"), default="json",
+                        help="output format (default: json)")
+    parser.add_argument("-o", "--output", help="write to OUTPUT instead of stdout")
+    parser.add_argument("--ttl", type=float,
+                        help="seconds cached responses stay fresh (default: $GAMMA_CACHE_TTL or 60, "
+                             "0 = no cache)")
+    args = parser.parse_args(argv)
+
+    if args.concurrency < 1:
+        parser.error("-j/--concurrency must be at least 1")
+    if args.rate < 0:
+        parser.error("--rate must be 0 (no limit) or more")
+
+    slugs = read_slugs(args)
+    if not slugs:
+        parser.error("no slugs given")
+
+    started = time.monotonic()
+    options = env_options()
+    if args.ttl is not None:
+        options["ttl"] = args.ttl
+    with GammaClient(pool_size=args.concurrency, **options) as client:
+        resolved, errors = asyncio.run(resolve_all(client, slugs, args.concurrency, args.rate))
+
+    out = open(args.output, "w", newline="") if args.output else sys.stdout
+    try:
+        if args.format == "csv":
+            write_csv(out, resolved)
+        else:
+            write_json(out, resolved, errors)
+    finally:
+        if args.output:
+            out.close()
+
+    for slug, error in errors.items():
+        print(f"❌ {slug}: {error}", file=sys.stderr)
+    print(f"✅ Resolved {len(resolved)}/{len(slugs)} slug(s) in {time.monotonic() - started:.1f}s",
+          file=sys.stderr)
+    return 1 if errors else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
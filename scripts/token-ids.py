@@ -3,28 +3,15 @@
 Quick token ID finder - shows just the token IDs for a market
 """
 
-import requests
-import json
 import sys
 
+from gamma_client import get_client
+
 def get_market_tokens(market_slug):
     """Get all tokens for a market, return as simple dict"""
     
-    url = f"https://gamma-api.polymarket.com/events?slug={market_slug}"
-    
     try:
-        resp = requests.get(url, timeout=30)
-        resp.raise_for_status()
-        data = resp.json()
-        
-        # Response can be dict or list
-        if isinstance(data, dict) and 'data' in data:
-            events = data['data']
-        elif isinstance(data, list):
-            events = data
-        else:
-            print(f"❌ Unexpected response format: {type(data)}")
-            return {}
+        events = get_client().events(slug=market_slug)
         
         if not events:
             print(f"❌ No event found")
@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+Local SQLite index of Polymarket events, markets and outcome token IDs
+
+Maps event slug, market slug, question text and outcome to clobTokenId,
+with full-text search over questions and event titles, so token lookups
+answer offline in well under a millisecond. It is filled in bulk from the
+Gamma /events endpoint and refreshed incrementally: events are paged
+newest-updated first and paging stops at the last refresh's watermark.
+
+Usage:
+  python3 token_index.py refresh [--full] [--max-pages N]
+  python3 token_index.py find <event-slug>
+  python3 token_index.py search <query>
+  python3 token_index.py stats
+
+Environment:
+  GAMMA_INDEX_PATH  index file (default: ~/.cache/gamma-api/tokens.sqlite)
+"""
+
+import argparse
+import os
+import re
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+from gamma_client import DEFAULT_CACHE_DIR, get_client, market_outcomes
+
+DEFAULT_INDEX_PATH = DEFAULT_CACHE_DIR / "tokens.sqlite"
+SCHEMA_VERSION = 2
+PAGE_SIZE = 100
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS events (
+    slug TEXT PRIMARY KEY,
+    title TEXT,
+    updated_at TEXT,
+    indexed_at TEXT
+);
+CREATE TABLE IF NOT EXISTS markets (
+    rowid INTEGER PRIMARY KEY,
+    id TEXT UNIQUE NOT NULL,
+    event_slug TEXT,
+    slug TEXT,
+    question TEXT,
+    updated_at TEXT
+);
+CREATE INDEX IF NOT EXISTS markets_event ON markets (event_slug);
+CREATE INDEX IF NOT EXISTS markets_slug ON markets (slug);
+CREATE TABLE IF NOT EXISTS tokens (
+    token_id TEXT PRIMARY KEY,
+    market_id TEXT NOT NULL,
+    position INTEGER,
+    outcome TEXT,
+    price REAL
+);
+CREATE INDEX IF NOT EXISTS tokens_market ON tokens (market_id);
+CREATE VIRTUAL TABLE IF NOT EXISTS markets_fts USING fts5 (question, title);
+"""
+
+TABLES = ("meta", "events", "markets", "tokens", "markets_fts")
+
+_TERM_RE = re.compile(r"\w+")
+
+def index_path():
+    return Path(os.environ.get("GAMMA_INDEX_PATH", DEFAULT_INDEX_PATH))
+
+def utc_now():
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+
+def fts_query(text):
+    """FTS5 query matching every word of text, the last one as a prefix."""
+    terms = _TERM_RE.findall(text.lower())
+    if not terms:
+        return None
+    return " ".join(f'"{term}"' for term in terms) + "*"
+
+class TokenIndex:
+    """SQLite-backed slug/question/outcome -> token ID index."""
+
+    def __init__(self, path=None):
+        self.path = Path(path) if path else index_path()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(self.path)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        schema = self.get_meta("schema")
+        if schema != str(SCHEMA_VERSION):
+            if schema is not None:
+                # An older layout: the index is only a cache, so start it over
+                for table in TABLES:
+                    self.db.execute(f"DROP TABLE IF EXISTS {table}")
+            self.db.executescript(SCHEMA)
+            self.set_meta("schema", SCHEMA_VERSION)
+            self.db.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.db.close()
+
+    def get_meta(self, key):
+        try:
+            row = self.db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        except sqlite3.OperationalError:
+            return None  # not created yet
+        return row[0] if row else None
+
+    def set_meta(self, key, value):
+        self.db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, str(value)))
+
+    def add_event(self, event):
+        """Insert or update one Gamma event with its markets and tokens (no commit)."""
+        slug = event.get("slug")
+        if not slug:
+            return
+        title = event.get("title") or ""
+        self.db.execute("INSERT OR REPLACE INTO events (slug, title, updated_at, indexed_at) "
+                        "VALUES (?, ?, ?, ?)", (slug, title, event.get("updatedAt"), utc_now()))
+        for market in event.get("markets", []):
+            market_id = str(market.get("id") or market.get("conditionId") or market.get("slug") or "")
+            if not market_id:
+                continue
+            question = market.get("question") or ""
+            row = self.db.execute("SELECT rowid FROM markets WHERE id = ?", (market_id,)).fetchone()
+            values = (slug, market.get("slug"), question, market.get("updatedAt"), market_id)
+            if row:
+                rowid = row[0]
+                self.db.execute("UPDATE markets SET event_slug = ?, slug = ?, question = ?, "
+                                "updated_at = ? WHERE id = ?", values)
+                self.db.execute("DELETE FROM markets_fts WHERE rowid = ?", (rowid,))
+            else:
+                rowid = self.db.execute("INSERT INTO markets (event_slug, slug, question, updated_at, id) "
+                                        "VALUES (?, ?, ?, ?, ?)", values).lastrowid
+            self.db.execute("INSERT INTO markets_fts (rowid, question, title) VALUES (?, ?, ?)",
+                            (rowid, question, title))
+            self.db.execute("DELETE FROM tokens WHERE market_id = ?", (market_id,))
+            self.db.executemany(
+                "INSERT OR REPLACE INTO tokens (token_id, market_id, position, outcome, price) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [(token_id, market_id, position, outcome, price)
+                 for position, (outcome, token_id, price) in enumerate(market_outcomes(market))
+                 if token_id and token_id != "None"])
+
+    def _markets(self, query, params):
+        """Markets selected by query (aliasing markets as m, events as e), with their tokens.
+
+        Token prices are as of indexed_at, when the event was last indexed.
+        """
+        markets = []
+        for row in self.db.execute(
+                f"SELECT m.id, m.slug, m.question, m.event_slug, e.title, e.indexed_at {query}", params):
+            tokens = [{"outcome": token["outcome"], "token_id": token["token_id"], "price": token["price"]}
+                      for token in self.db.execute(
+                          "SELECT outcome, token_id, price FROM tokens WHERE market_id = ? "
+                          "ORDER BY position", (row["id"],))]
+            markets.append({"question": row["question"], "slug": row["slug"],
+                            "event_slug": row["event_slug"], "event_title": row["title"],
+                            "indexed_at": row["indexed_at"], "tokens": tokens})
+        return markets
+
+    def event(self, slug):
+        """The event with this slug in the same shape as the API's, or None.
+
+        Its prices are as of its indexed_at time, not live.
+        """
+        row = self.db.execute("SELECT slug, title, indexed_at FROM events WHERE slug = ?",
+                              (slug,)).fetchone()
+        if row is None:
+            return None
+        return {"slug": row["slug"], "title": row["title"], "indexed_at": row["indexed_at"],
+                "markets": self._markets("FROM markets m LEFT JOIN events e ON e.slug = m.event_slug "
+                                         "WHERE m.event_slug = ? ORDER BY m.rowid", (slug,))}
+
+    def search(self, query, limit=10):
+        """Markets whose question or event title matches query, best first."""
+        match = fts_query(query)
+        if match is None:
+            return []
+        return self._markets("FROM markets_fts f JOIN markets m ON m.rowid = f.rowid "
+                             "LEFT JOIN events e ON e.slug = m.event_slug "
+                             "WHERE markets_fts MATCH ? ORDER BY f.rank LIMIT ?", (match, limit))
+
+    def token(self, token_id):
+        """(event slug, question, outcome, price, indexed_at) for a token ID, or None."""
+        row = self.db.execute(
+            "SELECT m.event_slug, m.question, t.outcome, t.price, e.indexed_at FROM tokens t "
+            "JOIN markets m ON m.id = t.market_id LEFT JOIN events e ON e.slug = m.event_slug "
+            "WHERE t.token_id = ?", (token_id,)).fetchone()
+        return tuple(row) if row else None
+
+    def stats(self):
+        counts = {table: self.db.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                  for table in ("events", "markets", "tokens")}
+        counts["watermark"] = self.get_meta("watermark")
+        counts["refreshed"] = self.get_meta("refreshed")
+        return counts
+
+    def refresh(self, client=None, full=False, max_pages=None, page_size=PAGE_SIZE):
+        """Pull new and updated active events from the Gamma API.
+
+        Pages /events newest-updated first and stops at the previous
+        refresh's watermark (or reads everything with full=True). Each page
+        is committed as it arrives, so an interrupted refresh keeps its
+        progress; the watermark only moves once a refresh completes, that
+        is reaches a short page or the old watermark. A refresh cut short
+        by max_pages leaves it alone, so the next one reads on past the
+        pages it skipped. Returns the number of events written.
+        """
+        client = client or get_client()
+        watermark = None if full else self.get_meta("watermark")
+        newest = None
+        written = 0
+        page = 0
+        complete = False
+        while max_pages is None or page < max_pages:
+            events = client.events(ttl=0, closed="false", order="updatedAt", ascending="false",
+                                   limit=page_size, offset=page * page_size)
+            page += 1
+            done = len(events) < page_size
+            for event in events:
+                updated = event.get("updatedAt") or ""
+                if watermark and updated and updated < watermark:
+                    done = True
+                    break
+                if newest is None or updated > newest:
+                    newest = updated
+                self.add_event(event)
+                written += 1
+            self.db.commit()
+            if done:
+                complete = True
+                break
+        if complete and newest:
+            self.set_meta("watermark", max(newest, watermark or ""))
+        self.set_meta("refreshed", utc_now())
+        self.db.commit()
+        return written
+
+def open_index():
+    """The index, or None when it cannot be opened (lookups then use the API)."""
+    try:
+        return TokenIndex()
+    except (OSError, sqlite3.Error):
+        return None
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local Polymarket token ID index")
+    sub = parser.add_subparsers(dest="command", required=True)
+    refresh = sub.add_parser("refresh", help="pull new and updated events from the Gamma API")
+    refresh.add_argument("--full", action="store_true", help="re-read every active event")
+    refresh.add_argument("--max-pages", type=int, help=f"stop after N pages of {PAGE_SIZE} events")
+    find = sub.add_parser("find", help="show the tokens of an event")
+    find.add_argument("slug")
+    search = sub.add_parser("search", help="full-text search over questions and titles")
+    search.add_argument("query", nargs="+")
+    search.add_argument("--limit", type=int, default=10)
+    sub.add_parser("stats", help="show index size and last refresh")
+    args = parser.parse_args(argv)
+
+    with TokenIndex() as index:
+        if args.command == "refresh":
+            started = time.monotonic()
+            written = index.refresh(full=args.full, max_pages=args.max_pages)
+            print(f"✅ Indexed {written} event(s) in {time.monotonic() - started:.1f}s ({index.path})")
+        elif args.command == "stats":
+            for key, value in index.stats().items():
+                print(f"{key:10s} {value}")
+        else:
+            started = time.perf_counter()
+            if args.command == "find":
+                event = index.event(args.slug)
+                markets = event["markets"] if event else []
+            else:
+                markets = index.search(" ".join(args.query), args.limit)
+            elapsed = (time.perf_counter() - started) * 1000
+            if not markets:
+                print("❌ Not in the index (run: token_index.py refresh)")
+                return 1
+            for market in markets:
+                print(f"{market['question']}  [{market['event_slug']}, prices as of {market['indexed_at']}]")
+                for token in market["tokens"]:
+                    price = f"{token['price'] * 100:.1f}%" if token["price"] is not None else "N/A"
+                    print(f"  {token['outcome']}: {price}  {token['token_id']}")
+            print(f"\n⏱️  {elapsed:.2f} ms")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,18 @@
+"""
+Shared rendering core for build.py and scripts/publish-blog.py.
+"""
+
+from .frontmatter import parse_front_matter, split_front_matter
+from .markdown import MarkdownRenderer, iter_markdown, parse_markdown, render_inline, render_markdown
+from .templates import render_document
+
+__all__ = [
+    'MarkdownRenderer',
+    'iter_markdown',
+    'parse_front_matter',
+    'parse_markdown',
+    'render_document',
+    'render_inline',
+    'render_markdown',
+    'split_front_matter',
+]
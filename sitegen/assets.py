@@ -0,0 +1,85 @@
+"""
+Static asset helpers: CSS minification and content-fingerprinted files.
+"""
+
+import hashlib
+import re
+from pathlib import Path
+
+_CSS_COMMENT_RE = re.compile(r'/\*.*?\*/', re.DOTALL)
+_CSS_SPACE_RE = re.compile(r'\s+')
+_CSS_PUNCT_RE = re.compile(r'\s*([{};,>])\s*')
+_CSS_COLON_RE = re.compile(r':\s+')
+
+# Quoted root-relative references to a top-level file, e.g. href="/oat.min.css"
+_ASSET_URL_RE = re.compile(r'(?P<quote>["\'])/(?P<name>[\w.-]+)(?P=quote)')
+
+def minify_css(css):
+    """Strip comments and redundant whitespace from a stylesheet.
+
+    Whitespace inside values such as calc(l - 2%) is collapsed to a single
+    space, never removed, so expressions keep their meaning.
+    """
+    css = _CSS_COMMENT_RE.sub('', css)
+    css = _CSS_SPACE_RE.sub(' ', css)
+    css = _CSS_PUNCT_RE.sub(r'\1', css)
+    css = _CSS_COLON_RE.sub(':', css)
+    return css.replace(';}', '}').strip()
+
+def fingerprint(data, length=10):
+    """Short content hash used in fingerprinted file names."""
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    return hashlib.sha256(data).hexdigest()[:length]
+
+def fingerprinted_name(stem, suffix, data):
+    """Return e.g. 'site.3f2a9c01bd.css' for the given contents."""
+    return f'{stem}.{fingerprint(data)}{suffix}'
+
+def asset_name(path):
+    """Fingerprinted name for a static asset file, e.g. 'oat.min.3f2a9c01bd.css'."""
+    path = Path(path)
+    return fingerprinted_name(path.stem, path.suffix, path.read_bytes())
+
+def rewrite_asset_urls(html_text, asset_names):
+    """Point root-relative references to assets at their fingerprinted names.
+
+    asset_names maps plain file names to fingerprinted ones; other
+    references are left as they are.
+    """
+    def replace(match):
+        name = asset_names.get(match.group('name'))
+        if name is None:
+            return match.group(0)
+        return f'{match.group("quote")}/{name}{match.group("quote")}'
+    return _ASSET_URL_RE.sub(replace, html_text)
+
+def write_if_changed(path, data):
+    """Write str or bytes to path unless it already holds them; return True if written."""
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    if path.exists() and path.read_bytes() == data:
+        return False
+    path.write_bytes(data)
+    return True
+
+def write_fingerprinted(output_dir, stem, suffix, data):
+    """Write data to output_dir under its fingerprinted name.
+
+    The file is left untouched when it already exists (same name means same
+    contents), and older fingerprints of the same stem are removed. Returns
+    the file name and whether it was written.
+    """
+    name = fingerprinted_name(stem, suffix, data)
+    path = output_dir / name
+    stale = re.compile(rf'{re.escape(stem)}\.[0-9a-f]{{10}}{re.escape(suffix)}$')
+    for old in output_dir.glob(f'{stem}.*{suffix}'):
+        if old.name != name and stale.match(old.name):
+            old.unlink()
+    if path.exists():
+        return name, False
+    if isinstance(data, str):
+        path.write_text(data, encoding='utf-8')
+    else:
+        path.write_bytes(data)
+    return name, True
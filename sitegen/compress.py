@@ -0,0 +1,69 @@
+"""
+Pre-compressed .gz/.br siblings for generated text assets, plus a size report.
+"""
+
+import gzip
+
+try:
+    import brotli
+except ImportError:  # optional: pip install brotli
+    brotli = None
+
+from .assets import write_if_changed
+from .parallel import map_files
+from .profiling import span
+
+# Generated files worth serving pre-compressed
+COMPRESS_SUFFIXES = ('.html', '.css', '.js')
+
+def compress_file(path):
+    """Write path.gz (and path.br when brotli is available).
+
+    Output is deterministic (gzip mtime is zeroed) and unchanged siblings are
+    not rewritten. Returns (raw, gzip, brotli) sizes in bytes; brotli is None
+    when the module is not installed.
+    """
+    with span('compress', file=path.name):
+        data = path.read_bytes()
+        gz = gzip.compress(data, compresslevel=9, mtime=0)
+        write_if_changed(path.with_name(path.name + '.gz'), gz)
+        br_size = None
+        if brotli is not None:
+            br = brotli.compress(data, quality=11)
+            write_if_changed(path.with_name(path.name + '.br'), br)
+            br_size = len(br)
+    return len(data), len(gz), br_size
+
+def compress_tree(root, jobs=1):
+    """Compress every HTML, CSS and JS file under root.
+
+    Returns a list of (relative path, sizes, error) rows in path order.
+    """
+    paths = sorted(p for p in root.rglob('*') if p.is_file() and p.suffix in COMPRESS_SUFFIXES)
+    results = map_files(compress_file, [(path,) for path in paths], jobs=jobs)
+    return [(path.relative_to(root).as_posix(), sizes, error)
+            for path, (sizes, error) in zip(paths, results)]
+
+def _kb(size):
+    return '-' if size is None else f'{size / 1024:.1f} KB'
+
+def format_size_table(rows):
+    """Format compress_tree() rows as a raw vs. compressed size table."""
+    width = max([len(name) for name, _, _ in rows] + [len('Total')])
+    lines = [f"{'File':<{width}}  {'Raw':>10}  {'gzip':>10}  {'brotli':>10}"]
+    total_raw = total_gz = 0
+    total_br = 0 if brotli is not None else None
+    for name, sizes, error in rows:
+        if error:
+            lines.append(f"{name:<{width}}  ✗ {error}")
+            continue
+        raw, gz, br = sizes
+        total_raw += raw
+        total_gz += gz
+        if total_br is not None:
+            total_br += br
+        lines.append(f"{name:<{width}}  {_kb(raw):>10}  {_kb(gz):>10}  {_kb(br):>10}")
+    lines.append(f"{'Total':<{width}}  {_kb(total_raw):>10}  {_kb(total_gz):>10}  {_kb(total_br):>10}")
+    if brotli is None:
+        lines.append("  (brotli not installed: .br files skipped; pip install brotli)")
+    return '\n'.join(lines)
@@ -0,0 +1,150 @@
+"""
+Critical CSS: the subset of a stylesheet needed to paint a template's
+above-the-fold markup, for inlining in <head> while the full stylesheets
+load without blocking render.
+
+Matching is deliberately generous: a selector is kept when every compound
+in it (tag, classes, ids, attribute names) occurs somewhere in the fold,
+ignoring combinators and pseudo-classes. Keeping a few extra rules only
+costs bytes; dropping a needed one would flash unstyled content.
+"""
+
+import re
+from html.parser import HTMLParser
+
+# Grouping at-rules whose children are filtered like top-level rules
+GROUPING_RULES = ('@media', '@layer', '@supports', '@container', '@starting-style')
+
+# At-rules kept whole: the cascade needs @layer order statements, and
+# fonts and registered properties are cheap and used everywhere
+KEEP_RULES = ('@font-face', '@property', '@charset', '@import', '@namespace', '@layer')
+
+# Selectors that match any document
+_ALWAYS = frozenset((':root', 'html', 'body', '*'))
+
+_PSEUDO_FUNC_RE = re.compile(r'::?[\w-]+\((?:[^()]|\([^()]*\))*\)')
+_PSEUDO_RE = re.compile(r'::?[\w-]+')
+_COMPOUND_RE = re.compile(r'[^\s>+~]+')
+_PART_RE = re.compile(r'(?P<kind>[.#]?)(?P<name>-?[\w-]+)|\[(?P<attr>[\w-]+)[^\]]*\]|\*|&')
+
+class _FoldScanner(HTMLParser):
+    """Collect the tags, classes, ids and attribute names used in markup."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.tags = set()
+        self.classes = set()
+        self.ids = set()
+        self.attrs = set()
+
+    def handle_starttag(self, tag, attrs):
+        self.tags.add(tag)
+        for name, value in attrs:
+            self.attrs.add(name)
+            if name == 'class' and value:
+                self.classes.update(value.split())
+            elif name == 'id' and value:
+                self.ids.add(value)
+
+def _split_rules(css):
+    """Split a rule list into top-level items: (prelude, body) or (statement, None)."""
+    items = []
+    depth = 0
+    quote = None
+    start = 0
+    prelude_end = None
+    i = 0
+    while i < len(css):
+        char = css[i]
+        if quote:
+            if char == '\\':
+                i += 1
+            elif char == quote:
+                quote = None
+        elif char in '"\'':
+            quote = char
+        elif char == '{':
+            if depth == 0:
+                prelude_end = i
+            depth += 1
+        elif char == '}':
+            depth -= 1
+            if depth == 0:
+                items.append((css[start:prelude_end].strip(), css[prelude_end + 1:i]))
+                start = i + 1
+        elif char == ';' and depth == 0:
+            items.append((css[start:i + 1].strip(), None))
+            start = i + 1
+        i += 1
+    if css[start:].strip():
+        items.append((css[start:].strip(), None))
+    return items
+
+def _selectors(prelude):
+    """Split a selector list on top-level commas."""
+    selectors = []
+    depth = 0
+    start = 0
+    for i, char in enumerate(prelude):
+        if char in '([':
+            depth += 1
+        elif char in ')]':
+            depth -= 1
+        elif char == ',' and depth == 0:
+            selectors.append(prelude[start:i].strip())
+            start = i + 1
+    selectors.append(prelude[start:].strip())
+    return selectors
+
+class CriticalCss:
+    """Extract the rules of a stylesheet that apply to some fold markup."""
+
+    def __init__(self, fold_html):
+        scanner = _FoldScanner()
+        scanner.feed(fold_html)
+        scanner.close()
+        self.tags = scanner.tags
+        self.classes = scanner.classes
+        self.ids = scanner.ids
+        self.attrs = scanner.attrs
+
+    def matches(self, selector):
+        """Whether every compound of a selector occurs somewhere in the fold."""
+        selector = _PSEUDO_RE.sub('', _PSEUDO_FUNC_RE.sub('', selector)).strip()
+        if not selector or selector in _ALWAYS:
+            return True
+        for compound in _COMPOUND_RE.findall(selector):
+            for part in _PART_RE.finditer(compound):
+                if part.group('attr'):
+                    if part.group('attr') not in self.attrs:
+                        return False
+                elif part.group('name'):
+                    kind, name = part.group('kind'), part.group('name')
+                    found = (self.classes if kind == '.' else self.ids if kind == '#'
+                             else self.tags)
+                    if (name.lower() if not kind else name) not in found:
+                        return False
+        return True
+
+    def extract(self, css):
+        """Return the critical subset of css, in source order."""
+        out = []
+        for prelude, body in _split_rules(css):
+            rule = prelude.split(None, 1)[0].split('(', 1)[0] if prelude.startswith('@') else None
+            if body is None:
+                if rule in KEEP_RULES:
+                    out.append(prelude)
+            elif rule is None:
+                if any(self.matches(selector) for selector in _selectors(prelude)):
+                    out.append(f'{prelude}{{{body}}}')
+            elif rule in GROUPING_RULES:
+                inner = self.extract(body)
+                if inner:
+                    out.append(f'{prelude}{{{inner}}}')
+            elif rule in KEEP_RULES:
+                out.append(f'{prelude}{{{body}}}')
+        return ''.join(out)
+
+def critical_css(css, fold_html):
+    """The rules of css needed to render fold_html."""
+    return CriticalCss(fold_html).extract(css)
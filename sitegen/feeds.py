@@ -0,0 +1,74 @@
+"""
+Atom and JSON Feed documents built from a metadata index.
+
+Feeds carry no build timestamps: a feed's updated time is its newest
+entry's, so unchanged content always produces identical bytes (and the
+same ETag from the web server).
+"""
+
+import json
+from xml.sax.saxutils import escape, quoteattr
+
+def _timestamp(date_iso):
+    """RFC 3339 timestamp for a YYYY-MM-DD date."""
+    return f'{date_iso}T00:00:00Z'
+
+def atom_feed(title, feed_url, home_url, entries, author='Duet Company'):
+    """Render an Atom 1.0 feed.
+
+    entries are dicts with absolute 'url', 'title', 'date_iso', 'summary'
+    and optional 'category', newest first.
+    """
+    updated = _timestamp(entries[0]['date_iso']) if entries else '1970-01-01T00:00:00Z'
+    lines = [
+        '<?xml version="1.0" encoding="utf-8"?>',
+        '<feed xmlns="http://www.w3.org/2005/Atom">',
+        f'  <title>{escape(title)}</title>',
+        f'  <id>{escape(feed_url)}</id>',
+        f'  <link rel="self" type="application/atom+xml" href={quoteattr(feed_url)}/>',
+        f'  <link rel="alternate" type="text/html" href={quoteattr(home_url)}/>',
+        f'  <updated>{updated}</updated>',
+        f'  <author><name>{escape(author)}</name></author>',
+    ]
+    for entry in entries:
+        lines += [
+            '  <entry>',
+            f'    <title>{escape(entry["title"])}</title>',
+            f'    <id>{escape(entry["url"])}</id>',
+            f'    <link rel="alternate" type="text/html" href={quoteattr(entry["url"])}/>',
+            f'    <published>{_timestamp(entry["date_iso"])}</published>',
+            f'    <updated>{_timestamp(entry["date_iso"])}</updated>',
+        ]
+        if entry.get('category'):
+            lines.append(f'    <category term={quoteattr(entry["category"])}/>')
+        lines += [
+            f'    <summary>{escape(entry["summary"])}</summary>',
+            '  </entry>',
+        ]
+    lines.append('</feed>')
+    return '\n'.join(lines) + '\n'
+
+def json_feed(title, feed_url, home_url, entries, author='Duet Company'):
+    """Render a JSON Feed 1.1 document from the same entries as atom_feed()."""
+    items = []
+    for entry in entries:
+        item = {
+            'id': entry['url'],
+            'url': entry['url'],
+            'title': entry['title'],
+            'summary': entry['summary'],
+            'content_text': entry['summary'],
+            'date_published': _timestamp(entry['date_iso']),
+        }
+        if entry.get('category'):
+            item['tags'] = [entry['category']]
+        items.append(item)
+    feed = {
+        'version': 'https://jsonfeed.org/version/1.1',
+        'title': title,
+        'home_page_url': home_url,
+        'feed_url': feed_url,
+        'authors': [{'name': author}],
+        'items': items,
+    }
+    return json.dumps(feed, indent=2, ensure_ascii=False) + '\n'
@@ -0,0 +1,53 @@
+"""
+Front matter shared by the site and blog builders.
+
+A source may open with a '---' line, flat 'key: value' fields and a
+closing '---' line. Values may be wrapped in single or double quotes;
+blank lines and '#' comments are ignored.
+"""
+
+from itertools import chain
+
+DELIMITER = '---'
+
+def parse_fields(lines):
+    """Parse 'key: value' front matter lines into a dict."""
+    fields = {}
+    for line in lines:
+        if ':' not in line or line.lstrip().startswith('#'):
+            continue
+        key, value = line.split(':', 1)
+        value = value.strip()
+        if len(value) >= 2 and value[0] == value[-1] and value[0] in '"\'':
+            value = value[1:-1]
+        fields[key.strip()] = value
+    return fields
+
+def split_front_matter(lines, max_lines=1000):
+    """Split front matter off an iterator of source lines.
+
+    Returns the fields and an iterator over the body lines (those after
+    the closing '---'). Without front matter, or with no closing '---'
+    within max_lines lines, returns ({}, all lines). Only the front matter
+    is buffered, so this suits streaming very large sources.
+    """
+    lines = iter(lines)
+    first = next(lines, None)
+    if first is None:
+        return {}, iter(())
+    if first.rstrip() != DELIMITER:
+        return {}, chain([first], lines)
+
+    head = []
+    for line in lines:
+        if line.rstrip() == DELIMITER:
+            return parse_fields(head), lines
+        head.append(line)
+        if len(head) >= max_lines:
+            break
+    return {}, chain([first], head, lines)
+
+def parse_front_matter(content):
+    """Split front matter off a source text; return (fields, body)."""
+    fields, lines = split_front_matter(content.split('\n'))
+    return fields, '\n'.join(lines)
@@ -0,0 +1,229 @@
+"""
+Responsive images for the generated site: raster images referenced by
+<img> tags get resized WebP variants, and the tags gain srcset, sizes,
+intrinsic dimensions and lazy loading.
+
+Variants are cached by source hash in docs/.image-cache.json, so a build
+only re-encodes images whose bytes changed.
+"""
+
+import html
+import re
+from html.parser import HTMLParser
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # optional: pip install Pillow
+    Image = None
+
+from .assets import write_if_changed
+from .links import resolve
+from .manifest import hash_file, load_manifest, save_manifest
+from .parallel import map_files
+from .profiling import span
+from .stream import feed_file
+
+MEDIA_DIR = 'media'
+CACHE_NAME = '.image-cache.json'
+CACHE_VERSION = 1
+
+# Formats worth re-encoding; SVG and GIF (often animated) are left alone
+IMAGE_SUFFIXES = ('.png', '.jpg', '.jpeg', '.webp')
+
+# Variant widths in pixels; images are never upscaled, and the largest
+# variant is the source width capped at MAX_WIDTH
+VARIANT_WIDTHS = (480, 960, 1440)
+MAX_WIDTH = 1920
+WEBP_QUALITY = 80
+
+# A comment or start tag, quoted attribute values included, so '<img' text
+# inside an attribute value is never taken for a tag
+_TAG_RE = re.compile(r'''<!--.*?-->|<(?P<name>[a-zA-Z][\w:-]*)(?:[^>"']|"[^"]*"|'[^']*')*>''',
+                     re.DOTALL)
+_ATTR_RE = re.compile(r'''\s([\w:-]+)(?:\s*=\s*("[^"]*"|'[^']*'|[^\s"'>]+))?''')
+
+def _attributes(tag):
+    """{name: (value, span)} for the attributes of one start tag."""
+    attrs = {}
+    for match in _ATTR_RE.finditer(tag, 4):
+        value = match.group(2) or ''
+        if value[:1] in ('"', "'"):
+            value = value[1:-1]
+        attrs[match.group(1).lower()] = (value, match.span())
+    return attrs
+
+def _set_attributes(tag, values):
+    """Replace or append attributes (values already HTML-safe) on a start tag."""
+    attrs = _attributes(tag)
+    # Replace from the end so earlier spans stay valid
+    for name, value in sorted(((n, v) for n, v in values.items() if n in attrs),
+                              key=lambda item: attrs[item[0]][1][0], reverse=True):
+        start, end = attrs[name][1]
+        tag = f'{tag[:start]} {name}="{value}"{tag[end:]}'
+    added = ''.join(f' {name}="{value}"' for name, value in values.items() if name not in attrs)
+    end = len(tag) - (2 if tag.endswith('/>') else 1)
+    return tag[:end].rstrip() + added + tag[end:] if added else tag
+
+class _ImageExtractor(HTMLParser):
+    """Collect the src of each <img> tag on a page ('' when it has none)."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.sources = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'img':
+            self.sources.append(dict(attrs).get('src') or '')
+
+def page_images(path, output_dir):
+    """Return an HTML page's <img> tag count and the site paths of the
+    local raster images it references."""
+    page_url = '/' + path.relative_to(output_dir).as_posix()
+    sources = feed_file(_ImageExtractor(), path).sources
+    found = []
+    for src in sources:
+        if not src:
+            continue
+        kind, target, _ = resolve(page_url, src)
+        if (kind == 'internal' and target.lower().endswith(IMAGE_SUFFIXES)
+                and not target.startswith(f'/{MEDIA_DIR}/')):
+            found.append(target)
+    return len(sources), found
+
+def make_variants(source, media_dir, source_hash):
+    """Encode WebP variants of one image; return (width, height, [(name, width)])."""
+    with span('image', file=source.name):
+        with Image.open(source) as image:
+            image = ImageOps.exif_transpose(image)
+            width, height = image.size
+            largest = min(width, MAX_WIDTH)
+            widths = [w for w in VARIANT_WIDTHS if w < largest] + [largest]
+            if image.mode not in ('RGB', 'RGBA'):
+                alpha = 'A' in image.getbands() or 'transparency' in image.info
+                image = image.convert('RGBA' if alpha else 'RGB')
+            variants = []
+            for variant_width in widths:
+                name = f'{source.stem}-{variant_width}.{source_hash[:10]}.webp'
+                path = media_dir / name
+                if not path.exists():
+                    variant_height = max(1, round(height * variant_width / width))
+                    resized = image.resize((variant_width, variant_height), Image.LANCZOS)
+                    tmp_path = path.with_name(path.name + '.tmp')
+                    resized.save(tmp_path, 'WEBP', quality=WEBP_QUALITY, method=6)
+                    tmp_path.replace(path)
+                variants.append((name, variant_width))
+    return width, height, variants
+
+def rewrite_images(html_text, page_url, images):
+    """Add srcset, sizes, dimensions and lazy loading to a page's <img> tags.
+
+    images maps site paths to cache entries from optimize_images(). The
+    first image on a page is likely the largest contentful paint, so it is
+    not lazy-loaded; explicit loading, width and height attributes and
+    hand-written srcsets are kept.
+    """
+    first = True
+
+    def replace(match):
+        nonlocal first
+        tag = match.group(0)
+        if (match.group('name') or '').lower() != 'img':
+            return tag
+        attrs = _attributes(tag)
+        values = {}
+        if 'loading' not in attrs and not first:
+            values['loading'] = 'lazy'
+        if 'decoding' not in attrs:
+            values['decoding'] = 'async'
+        first = False
+        src = attrs.get('src')
+        entry = None
+        if src:
+            kind, target, _ = resolve(page_url, html.unescape(src[0]))
+            entry = images.get(target) if kind == 'internal' else None
+        own_srcset = 'srcset' not in attrs or f'/{MEDIA_DIR}/' in attrs['srcset'][0]
+        if entry and own_srcset:
+            values['srcset'] = ', '.join(f'/{MEDIA_DIR}/{name} {width}w'
+                                         for name, width in entry['variants'])
+            largest = entry['variants'][-1][1]
+            values['sizes'] = f'(max-width: {largest}px) 100vw, {largest}px'
+            if 'width' not in attrs and 'height' not in attrs:
+                values['width'] = str(entry['width'])
+                values['height'] = str(entry['height'])
+        return _set_attributes(tag, values) if values else tag
+
+    return _TAG_RE.sub(replace, html_text)
+
+def optimize_images(output_dir, pages, jobs=1):
+    """Generate variants for every image the given pages reference and rewrite them.
+
+    pages are HTML paths relative to output_dir; other files under it (such
+    as blog posts, which have their own publisher and manifest) are left
+    alone. Variants go to docs/media/; ones no longer referenced are removed.
+    Without Pillow no variants are made, but tags still get lazy loading.
+    Returns (images, encoded, rewritten page paths relative to output_dir,
+    errors as (site path, message)).
+    """
+    media_dir = output_dir / MEDIA_DIR
+    cache_path = output_dir / CACHE_NAME
+    old_cache = load_manifest(cache_path, CACHE_VERSION).get('images', {})
+    pages = [output_dir / page for page in sorted(pages) if (output_dir / page).is_file()]
+
+    with span('find_images'):
+        # Pages are scanned block by block; only those with <img> tags are
+        # later read whole to be rewritten
+        with_images = []
+        referenced = set()
+        for path in pages:
+            count, found = page_images(path, output_dir)
+            if count:
+                with_images.append(path)
+                referenced.update(found)
+        referenced = sorted(referenced)
+
+    entries = {}
+    stale = []
+    errors = []
+    if Image is None:
+        # Keep previously generated variants rather than dropping them
+        entries = {target: old_cache[target] for target in referenced if target in old_cache}
+    else:
+        for target in referenced:
+            source = output_dir / target.lstrip('/')
+            if not source.is_file():
+                continue  # reported by the link checker
+            source_hash = hash_file(source)
+            cached = old_cache.get(target)
+            if (cached and cached['hash'] == source_hash
+                    and all((media_dir / name).exists() for name, _ in cached['variants'])):
+                entries[target] = cached
+            else:
+                stale.append((target, source, source_hash))
+
+    if stale:
+        media_dir.mkdir(exist_ok=True)
+        results = map_files(make_variants, [(source, media_dir, source_hash)
+                                            for _, source, source_hash in stale], jobs=jobs)
+        for (target, _, source_hash), (result, error) in zip(stale, results):
+            if error:
+                errors.append((target, error))
+                continue
+            width, height, variants = result
+            entries[target] = {'hash': source_hash, 'width': width, 'height': height,
+                               'variants': [list(variant) for variant in variants]}
+
+    rewritten = []
+    with span('rewrite_images'):
+        for path in with_images:
+            page_url = '/' + path.relative_to(output_dir).as_posix()
+            html_text = path.read_text(encoding='utf-8')
+            if write_if_changed(path, rewrite_images(html_text, page_url, entries)):
+                rewritten.append(path.relative_to(output_dir).as_posix())
+
+    if media_dir.is_dir():
+        keep = {name for entry in entries.values() for name, _ in entry['variants']}
+        for path in media_dir.glob('*.webp'):
+            if path.name not in keep:
+                path.unlink()
+    save_manifest(cache_path, {'version': CACHE_VERSION, 'images': entries})
+    return len(referenced), len(stale), rewritten, errors
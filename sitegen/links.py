@@ -0,0 +1,184 @@
+"""
+Link checker for the generated site: internal links and #anchors are
+validated against the set of built files, external URLs optionally over
+HTTP with an on-disk result cache.
+"""
+
+import posixpath
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from html.parser import HTMLParser
+from urllib.parse import unquote, urlsplit
+
+from .manifest import load_manifest, save_manifest
+from .parallel import map_files
+from .profiling import span
+from .stream import feed_file
+
+CACHE_NAME = '.link-cache.json'
+CACHE_VERSION = 1
+
+# Attributes holding a URL, per tag
+LINK_ATTRS = {
+    'a': 'href',
+    'link': 'href',
+    'script': 'src',
+    'img': 'src',
+    'source': 'src',
+    'iframe': 'src',
+}
+
+USER_AGENT = 'duet-company-linkcheck/1.0'
+
+class _LinkExtractor(HTMLParser):
+    """Collect a page's outgoing links and its anchor targets."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.links = []   # (url, line)
+        self.anchors = set()
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        for name in ('id', 'name') if tag == 'a' else ('id',):
+            if attrs.get(name):
+                self.anchors.add(attrs[name])
+        url = attrs.get(LINK_ATTRS.get(tag))
+        if url and not (tag == 'link' and attrs.get('rel') in ('preconnect', 'dns-prefetch')):
+            self.links.append((url.strip(), self.getpos()[0]))
+
+def scan_page(path):
+    """Parse one page; return (links, anchors)."""
+    with span('scan_links', file=path.name):
+        parser = feed_file(_LinkExtractor(), path)
+    return parser.links, sorted(parser.anchors)
+
+def resolve(page_url, url):
+    """Resolve a link on page_url to a site path and fragment.
+
+    Returns ('internal', path, fragment), ('external', url, None) or
+    ('skip', None, None) for mailto: and similar.
+    """
+    parts = urlsplit(url)
+    if parts.scheme in ('http', 'https') or url.startswith('//'):
+        return 'external', url if parts.scheme else 'https:' + url, None
+    if parts.scheme:
+        return 'skip', None, None
+    path = unquote(parts.path)
+    if not path:
+        path = page_url
+    elif not path.startswith('/'):
+        path = posixpath.join(posixpath.dirname(page_url), path)
+    normalized = posixpath.normpath(path)
+    if path.endswith('/') and normalized != '/':
+        normalized += '/'
+    return 'internal', normalized, unquote(parts.fragment)
+
+def _target(path, files):
+    """Built file a site path serves, or None."""
+    if path.startswith('/..'):
+        return None
+    if path.endswith('/'):
+        path += 'index.html'
+    if path in files:
+        return path
+    if path + '/index.html' in files:
+        return path + '/index.html'
+    return None
+
+def check_external(urls, cache_path, ttl=86400, timeout=10, workers=16, offline=False):
+    """Check external URLs, reusing cached results younger than ttl seconds.
+
+    Only answers from a server are cached; connection errors are retried
+    on the next run. With offline=True only the cache is consulted and
+    uncached URLs pass unchecked. Returns {url: error or None}.
+    """
+    cache = load_manifest(cache_path, CACHE_VERSION).get('urls', {})
+    now = time.time()
+    results = {}
+    pending = []
+    for url in sorted(urls):
+        cached = cache.get(url)
+        if cached and now - cached['checked'] < ttl:
+            results[url] = cached['error']
+        elif offline:
+            results[url] = None
+        else:
+            pending.append(url)
+
+    def fetch(url):
+        """Return (error or None, whether the server answered)."""
+        with span('external', 'link', url=url):
+            for method in ('HEAD', 'GET'):
+                request = urllib.request.Request(url, method=method, headers={'User-Agent': USER_AGENT})
+                try:
+                    with urllib.request.urlopen(request, timeout=timeout):
+                        return None, True
+                except urllib.error.HTTPError as e:
+                    # Some servers refuse HEAD; retry those with GET
+                    if method == 'HEAD' and e.code in (403, 405, 501):
+                        continue
+                    return f'HTTP {e.code}', True
+                except (urllib.error.URLError, OSError, ValueError) as e:
+                    return str(getattr(e, 'reason', e)), False
+            return None, True
+
+    if pending:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for url, (error, answered) in zip(pending, pool.map(fetch, pending)):
+                results[url] = error
+                if answered:
+                    cache[url] = {'error': error, 'checked': now}
+        save_manifest(cache_path, {'version': CACHE_VERSION, 'urls': cache})
+    return results
+
+def check_links(output_dir, jobs=1, external=False, offline=False, ttl=86400):
+    """Check every link in the HTML pages under output_dir.
+
+    Internal links must point at a built file (and an existing id for
+    #anchors on HTML pages); external links are only checked when asked.
+    Returns a sorted list of (page, line, url, problem).
+    """
+    files = {'/' + path.relative_to(output_dir).as_posix()
+             for path in output_dir.rglob('*') if path.is_file()}
+    pages = sorted(path for path in output_dir.rglob('*.html'))
+    results = map_files(scan_page, [(path,) for path in pages], jobs=jobs)
+
+    problems = []
+    anchors = {}
+    scanned = []
+    for path, (result, error) in zip(pages, results):
+        page_url = '/' + path.relative_to(output_dir).as_posix()
+        if error:
+            problems.append((page_url, 0, '', f'could not parse: {error}'))
+            continue
+        links, page_anchors = result
+        anchors[page_url] = set(page_anchors)
+        scanned.append((page_url, links))
+
+    with span('check_links'):
+        outbound = {}
+        for page_url, links in scanned:
+            for url, line in links:
+                kind, target, fragment = resolve(page_url, url)
+                if kind == 'external':
+                    outbound.setdefault(target, []).append((page_url, line, url))
+                elif kind == 'internal':
+                    built = _target(target, files)
+                    if built is None:
+                        problems.append((page_url, line, url, 'missing page or file'))
+                    elif fragment and built in anchors and fragment not in anchors[built]:
+                        problems.append((page_url, line, url, f'missing anchor #{fragment}'))
+
+    if external and outbound:
+        checked = check_external(outbound, output_dir / CACHE_NAME, ttl=ttl, offline=offline)
+        for target, uses in outbound.items():
+            if checked.get(target):
+                problems.extend((page, line, url, checked[target]) for page, line, url in uses)
+    return sorted(problems)
+
+def format_problems(problems):
+    """One line per broken link, grouped by page."""
+    return '\n'.join(f'  {page}:{line}: {url} ({problem})' for page, line, url, problem in problems)
@@ -0,0 +1,51 @@
+"""
+Content-hash manifests for incremental builds.
+"""
+
+import hashlib
+import json
+import os
+
+def hash_bytes(data):
+    """Return the SHA-256 hex digest of a bytes object."""
+    return hashlib.sha256(data).hexdigest()
+
+def hash_file(path):
+    """Return the SHA-256 hex digest of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def hash_sources(paths):
+    """Hash a list of source files, e.g. a builder and the sitegen package."""
+    return hash_bytes('\0'.join(hash_file(path) for path in paths).encode('utf-8'))
+
+def load_manifest(path, version):
+    """Load a manifest, or an empty one if missing, corrupt or outdated."""
+    try:
+        with open(path, 'r') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if manifest.get('version') != version:
+        return {}
+    return manifest
+
+def save_manifest(path, manifest):
+    """Persist a manifest atomically, leaving the file untouched if unchanged."""
+    data = json.dumps(manifest, indent=2, sort_keys=True) + '\n'
+    if path.exists() and path.read_text() == data:
+        return
+    tmp_path = path.with_name(path.name + '.tmp')
+    tmp_path.write_text(data)
+    os.replace(tmp_path, path)
+
+def is_fresh(entry, input_hash, output_path):
+    """Check whether an output was built from these inputs and is intact."""
+    if not entry or entry.get('input') != input_hash:
+        return False
+    if not output_path.exists():
+        return False
+    return hash_file(output_path) == entry.get('output')
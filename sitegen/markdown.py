@@ -0,0 +1,318 @@
+"""
+Single-pass Markdown to HTML engine shared by the site and blog builders.
+"""
+
+import html
+import re
+from functools import lru_cache
+from itertools import islice
+
+# Markdown block syntax: one precompiled pattern classifies every line.
+# Lines it does not match (returns None) are paragraph text.
+_BLOCK_RE = re.compile(
+    r'(?P<indent>[ \t]*)(?:'
+    r'(?P<fence>```.*)'
+    r'|(?P<hashes>#{1,6})[ \t]+(?P<heading>\S.*?)'
+    r'|[-*][ \t]+(?P<bullet>\S.*?)'
+    r'|(?P<number>\d+)\.[ \t]+(?P<ordered>\S.*?)'
+    r')?[ \t]*$'
+)
+
+# GFM table delimiter row, e.g. |---|:--:|
+_TABLE_DELIMITER_RE = re.compile(r'\|?(?:[ \t]*:?-+:?[ \t]*\|)+(?:[ \t]*:?-+:?[ \t]*)?$')
+
+# First characters that can start a non-paragraph block line
+_BLOCK_STARTS = frozenset(' \t`#-*0123456789')
+
+# Inline spans, rendered in one left-to-right substitution pass
+_INLINE_RE = re.compile(
+    r'`(?P<code>[^`]+)`'
+    r'|\*\*(?P<strong>.+?)\*\*'
+    r'|\*(?P<em>[^*\s][^*]*?)\*'
+    r'|!\[(?P<alt>[^\]]*)\]\((?P<src>[^)\s]*)\)'
+    r'|\[(?P<text>[^\]]*)\]\((?P<href>[^)\s]*)\)'
+)
+
+def _render_span(match):
+    """Render one inline span matched by _INLINE_RE."""
+    kind = match.lastgroup
+    if kind == 'code':
+        return f'<code>{html.escape(match.group("code"), quote=False)}</code>'
+    if kind == 'strong':
+        return f'<strong>{render_inline(match.group("strong"))}</strong>'
+    if kind == 'em':
+        return f'<em>{render_inline(match.group("em"))}</em>'
+    if kind == 'src':
+        return f'<img src="{html.escape(match.group("src"))}" alt="{html.escape(match.group("alt"))}">'
+    return f'<a href="{match.group("href")}">{render_inline(match.group("text"))}</a>'
+
+def render_inline(text):
+    """Render inline Markdown spans (code, bold, italic, images, links)."""
+    if '`' not in text and '*' not in text and '[' not in text:
+        return text
+    return _INLINE_RE.sub(_render_span, text)
+
+def _escape_code(line):
+    """Escape a code block line, skipping the common no-op case."""
+    if '&' in line or '<' in line or '>' in line:
+        return html.escape(line, quote=False)
+    return line
+
+def _split_row(line):
+    """Split a table row into its stripped cell texts."""
+    line = line.strip()
+    if line.startswith('|'):
+        line = line[1:]
+    if line.endswith('|'):
+        line = line[:-1]
+    return [cell.strip() for cell in line.split('|')]
+
+def _cell_align(delimiter):
+    """Return the alignment named by a delimiter cell, or None."""
+    if delimiter.startswith(':') and delimiter.endswith(':'):
+        return 'center'
+    if delimiter.endswith(':'):
+        return 'right'
+    if delimiter.startswith(':'):
+        return 'left'
+    return None
+
+class MarkdownRenderer:
+    """Single-pass Markdown to HTML renderer.
+
+    Lines are fed in with feed_lines() and HTML lines accumulate in
+    self.out. Supports headings, fenced code, paragraphs, GFM tables and
+    nested bullet/ordered lists (indenting two or more columns nests a list).
+    """
+
+    def __init__(self):
+        self.out = []
+        self.lists = []        # open lists, innermost last: [indent, tag, li_open]
+        self.li_index = -1     # index in self.out of the innermost open <li>
+        self.in_code = False
+        self.code_open = False   # self.out ends with a <pre><code> still awaiting its first line
+        self.table_row = None  # a '|' line that may be a table header
+        self.table_align = None  # column alignments while inside a table
+
+    def close_item(self):
+        entry = self.lists[-1]
+        if not entry[2]:
+            return
+        out = self.out
+        if self.li_index == len(out) - 1:
+            out[-1] += '</li>'
+        else:
+            out.append('</li>')
+        entry[2] = False
+
+    def close_list(self):
+        self.close_item()
+        self.out.append(f'</{self.lists.pop()[1]}>')
+
+    def close_lists(self):
+        while self.lists:
+            self.close_list()
+
+    def open_list(self, indent, tag, number):
+        if tag == 'ol' and number != 1:
+            self.out.append(f'<ol start="{number}">')
+        else:
+            self.out.append(f'<{tag}>')
+        self.lists.append([indent, tag, False])
+
+    def add_item(self, indent, tag, number, text):
+        lists = self.lists
+        while len(lists) > 1 and indent < lists[-1][0]:
+            self.close_list()
+        if not lists or indent >= lists[-1][0] + 2:
+            self.open_list(indent, tag, number)
+        elif lists[-1][1] != tag:
+            indent = lists[-1][0]
+            self.close_list()
+            self.open_list(indent, tag, number)
+        else:
+            self.close_item()
+        self.out.append(f'<li>{render_inline(text)}')
+        self.li_index = len(self.out) - 1
+        lists[-1][2] = True
+
+    def table_cells(self, line, tag):
+        """Render one table row with the current column alignments."""
+        cells = _split_row(line)
+        align = self.table_align
+        cells += [''] * (len(align) - len(cells))
+        parts = []
+        for cell, cell_align in zip(cells, align):
+            if cell_align:
+                parts.append(f'<{tag} style="text-align: {cell_align}">{render_inline(cell)}</{tag}>')
+            else:
+                parts.append(f'<{tag}>{render_inline(cell)}</{tag}>')
+        return '<tr>' + ''.join(parts) + '</tr>'
+
+    def feed_table_line(self, line):
+        """Handle a line starting with '|' (a table row or plain text)."""
+        out = self.out
+        if self.table_align is not None:
+            out.append(self.table_cells(line, 'td'))
+            return
+        if self.lists:
+            self.close_lists()
+        header = self.table_row
+        if header is not None and _TABLE_DELIMITER_RE.match(line.strip()):
+            self.table_row = None
+            self.table_align = [_cell_align(cell) for cell in _split_row(line)]
+            out.append('<table>')
+            out.append('<thead>')
+            out.append(self.table_cells(header, 'th'))
+            out.append('</thead>')
+            out.append('<tbody>')
+            return
+        if header is not None:
+            out.append(f'<p>{render_inline(header)}</p>')
+        self.table_row = line
+
+    def close_table(self):
+        """End a table, or emit a lone header candidate as a paragraph."""
+        if self.table_align is not None:
+            self.out.append('</tbody>')
+            self.out.append('</table>')
+            self.table_align = None
+        elif self.table_row is not None:
+            self.out.append(f'<p>{render_inline(self.table_row)}</p>')
+            self.table_row = None
+
+    def feed_lines(self, lines):
+        """Render an iterable of Markdown source lines."""
+        out = self.out
+        append = out.append
+        match_block = _BLOCK_RE.match
+        block_starts = _BLOCK_STARTS
+        in_code = self.in_code
+        code_open = self.code_open
+
+        for line in lines:
+            if in_code:
+                if '```' in line and line.lstrip().startswith('```'):
+                    if code_open:
+                        out[-1] += '</code></pre>'
+                        code_open = False
+                    else:
+                        append('</code></pre>')
+                    in_code = False
+                elif code_open:
+                    # The first code line shares the <pre><code> line
+                    out[-1] += _escape_code(line)
+                    code_open = False
+                else:
+                    append(_escape_code(line))
+                continue
+
+            if line[:1] == '|':
+                self.feed_table_line(line)
+                continue
+            if self.table_row is not None or self.table_align is not None:
+                self.close_table()
+
+            if not line:
+                if self.lists:
+                    self.close_lists()
+                append('')
+                continue
+
+            match = match_block(line) if line[0] in block_starts else None
+            if match is None:
+                if self.lists:
+                    self.close_lists()
+                append(f'<p>{render_inline(line)}</p>')
+                continue
+
+            kind = match.lastgroup
+            if kind == 'bullet':
+                indent = len(match.group('indent').expandtabs(4))
+                self.add_item(indent, 'ul', 1, match.group('bullet'))
+                continue
+            if kind == 'ordered':
+                indent = len(match.group('indent').expandtabs(4))
+                self.add_item(indent, 'ol', int(match.group('number')), match.group('ordered'))
+                continue
+
+            if self.lists:
+                self.close_lists()
+            if kind == 'heading':
+                level = len(match.group('hashes'))
+                append(f'<h{level}>{render_inline(match.group("heading"))}</h{level}>')
+            elif kind == 'fence':
+                append('<pre><code>')
+                in_code = True
+                code_open = True
+            else:
+                append('')
+
+        self.in_code = in_code
+        self.code_open = code_open
+
+    def close(self):
+        """Close any blocks still open at the end of the input."""
+        if self.in_code:
+            if self.code_open:
+                self.out[-1] += '</code></pre>'
+                self.code_open = False
+            else:
+                self.out.append('</code></pre>')
+            self.in_code = False
+        self.close_table()
+        self.close_lists()
+
+    def drain(self):
+        """Remove and return the output lines that are final.
+
+        A trailing open <li> or empty <pre><code> stays behind, since more
+        may still be appended to the same line.
+        """
+        out = self.out
+        if self.code_open:
+            self.out = [out.pop()]
+            self.li_index = -1
+        elif self.lists and self.lists[-1][2] and self.li_index == len(out) - 1:
+            self.out = [out.pop()]
+            self.li_index = 0
+        else:
+            self.out = []
+            self.li_index = -1
+        return out
+
+def parse_markdown(content):
+    """Parse markdown and convert to HTML."""
+    renderer = MarkdownRenderer()
+    renderer.feed_lines(content.split('\n'))
+    renderer.close()
+    return '\n'.join(renderer.out)
+
+def iter_markdown(lines, batch_size=512):
+    """Render Markdown source lines lazily, yielding chunks of HTML.
+
+    The chunks concatenate to exactly parse_markdown('\n'.join(lines)).
+    Only batch_size source lines and their output are held at a time, so
+    memory stays bounded however long the document is.
+    """
+    renderer = MarkdownRenderer()
+    lines = iter(lines)
+    separator = ''
+    while True:
+        batch = list(islice(lines, batch_size))
+        if not batch:
+            break
+        renderer.feed_lines(batch)
+        done = renderer.drain()
+        if done:
+            yield separator + '\n'.join(done)
+            separator = '\n'
+    renderer.close()
+    done = renderer.drain()
+    if done:
+        yield separator + '\n'.join(done)
+
+@lru_cache(maxsize=256)
+def render_markdown(content):
+    """Cached parse_markdown, for callers that may render a source twice."""
+    return parse_markdown(content)
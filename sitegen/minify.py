@@ -0,0 +1,141 @@
+"""
+HTML minification for generated pages: comments stripped, whitespace
+collapsed outside <pre>/<textarea>/<script>/<style>, and inline SVG icons
+repeated by the page templates replaced with references into one sprite.
+"""
+
+import hashlib
+import re
+
+from .assets import fingerprinted_name
+
+# Elements whose contents are kept byte for byte
+_RAW_OPEN_RE = re.compile(r'<(pre|textarea|script|style)\b[^>]*>', re.IGNORECASE)
+
+_COMMENT_RE = re.compile(r'<!--(?!\[if).*?-->', re.DOTALL)
+_SPACE_RE = re.compile(r'\s+')
+
+# Whitespace next to block-level tags never renders, so it is dropped
+_BLOCK_TAG_RE = re.compile(
+    r'\s*(</?(?:html|head|body|meta|link|title|script|style|header|footer|main|nav|section|'
+    r'article|aside|div|p|ul|ol|li|h[1-6]|table|thead|tbody|tr|th|td|pre|form|svg|path|symbol|'
+    r'use|br|hr)\b[^>]*>)\s*',
+    re.IGNORECASE,
+)
+
+_SVG_RE = re.compile(r'<svg\b(?P<attrs>[^>]*)>(?P<body>.*?)</svg>', re.DOTALL | re.IGNORECASE)
+_VIEWBOX_RE = re.compile(r'\s(viewBox="[^"]*")')
+
+def _collapse(text):
+    text = _COMMENT_RE.sub('', text)
+    text = _SPACE_RE.sub(' ', text)
+    return _BLOCK_TAG_RE.sub(r'\1', text)
+
+class Sprite:
+    """SVG sprite of the icons found in a set of template shells.
+
+    Pages reference each icon as <svg ...><use href="/sprite.<hash>.svg#id"/>
+    instead of repeating its markup; write the sprite itself with
+    write_fingerprinted(output_dir, 'sprite', '.svg', sprite.svg).
+    """
+
+    def __init__(self, shells):
+        self.symbols = {}  # collapsed svg body -> (id, viewBox attribute)
+        for shell in shells:
+            for match in _SVG_RE.finditer(shell):
+                body = _collapse(match.group('body')).strip()
+                if body not in self.symbols:
+                    viewbox = _VIEWBOX_RE.search(match.group('attrs'))
+                    icon_id = 'i-' + hashlib.sha256(body.encode('utf-8')).hexdigest()[:8]
+                    self.symbols[body] = (icon_id, viewbox.group(1) if viewbox else '')
+        symbols = ''.join(f'<symbol id="{icon_id}" {viewbox}>{body}</symbol>'
+                          for body, (icon_id, viewbox) in self.symbols.items())
+        self.svg = f'<svg xmlns="http://www.w3.org/2000/svg">{symbols}</svg>\n'
+        self.name = fingerprinted_name('sprite', '.svg', self.svg)
+
+    def replace(self, html_text):
+        """Point inline SVGs that are in the sprite at their symbol."""
+        def use(match):
+            entry = self.symbols.get(_collapse(match.group('body')).strip())
+            if entry is None:
+                return match.group(0)
+            return f'<svg{match.group("attrs")}><use href="/{self.name}#{entry[0]}"/></svg>'
+        return _SVG_RE.sub(use, html_text)
+
+def _split_point(text):
+    """End of the part of text that minifies the same whatever follows it.
+
+    That is just after a '>' followed by content (not whitespace), and
+    outside any <svg> element, since those are replaced as a whole.
+    """
+    end = len(text)
+    while True:
+        split = text.rfind('>', 0, end)
+        while split != -1 and (split + 1 == len(text) or text[split + 1].isspace()):
+            split = text.rfind('>', 0, split)
+        if split == -1:
+            return 0
+        split += 1
+        svg = text.rfind('<svg', 0, split)
+        if svg == -1 or text.find('</svg>', svg, split) != -1:
+            return split
+        end = svg
+
+class HtmlMinifier:
+    """Incremental HTML minifier for pages written in chunks.
+
+    feed() takes consecutive pieces of a document and returns minified
+    output; close() returns the rest. The text after the last tag that is
+    directly followed by content is held back, so whitespace is collapsed
+    exactly as if the document had been minified in one piece.
+    """
+
+    def __init__(self, sprite=None):
+        self.sprite = sprite
+        self.raw_tag = None  # open element whose contents are kept as is
+        self.pending = ''
+
+    def feed(self, text):
+        text = self.pending + text
+        split = _split_point(text)
+        self.pending = text[split:]
+        return self._minify(text[:split])
+
+    def close(self):
+        text, self.pending = self.pending, ''
+        return self._minify(text)
+
+    def _minify(self, text):
+        if self.sprite is not None and '<svg' in text:
+            text = self.sprite.replace(text)
+        out = []
+        pos = 0
+        while pos < len(text):
+            if self.raw_tag:
+                end = text.lower().find(f'</{self.raw_tag}', pos)
+                if end == -1:
+                    out.append(text[pos:])
+                    break
+                out.append(text[pos:end])
+                pos = end
+                self.raw_tag = None
+            else:
+                match = _RAW_OPEN_RE.search(text, pos)
+                stop = match.end() if match else len(text)
+                out.append(_collapse(text[pos:stop]))
+                if match:
+                    self.raw_tag = match.group(1).lower()
+                pos = stop
+        return ''.join(out)
+
+def minify_html(html_text, sprite=None):
+    """Minify a complete HTML document."""
+    minifier = HtmlMinifier(sprite)
+    return minifier.feed(html_text) + minifier.close()
+
+def format_savings(raw, minified):
+    """'123.4 KB -> 98.7 KB (saved 24.7 KB, 20.0%)'"""
+    saved = raw - minified
+    percent = saved / raw * 100 if raw else 0.0
+    return (f'{raw / 1024:.1f} KB -> {minified / 1024:.1f} KB '
+            f'(saved {saved / 1024:.1f} KB, {percent:.1f}%)')
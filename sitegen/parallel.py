@@ -0,0 +1,53 @@
+"""
+Fan per-file work out to a process pool, keeping results in input order.
+"""
+
+import os
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from .profiling import PROFILER
+
+def resolve_jobs(jobs):
+    """Turn a --jobs value into a worker count (0 or less means all cores)."""
+    if jobs is None or jobs <= 0:
+        return os.cpu_count() or 1
+    return jobs
+
+def _guarded(func, args):
+    """Call func(*args), returning (result, None) or (None, error text)."""
+    try:
+        return func(*args), None
+    except Exception as e:
+        detail = traceback.format_exception_only(type(e), e)[-1].strip()
+        return None, detail
+
+def _guarded_worker(func, profile, args):
+    """_guarded in a pool worker, also shipping back any profiling spans."""
+    PROFILER.enabled = profile
+    PROFILER.events = []  # forked workers inherit the parent's events
+    result, error = _guarded(func, args)
+    return result, error, PROFILER.drain()
+
+def map_files(func, arg_tuples, jobs=1):
+    """Apply func to each argument tuple, across `jobs` processes.
+
+    Returns a list of (result, error) pairs in the same order as
+    arg_tuples. A failure in one file is reported in its error slot and
+    does not stop the others. func must be a module-level function so it
+    can be pickled to the workers. Profiling spans recorded in workers are
+    merged into the parent's PROFILER.
+    """
+    arg_tuples = list(arg_tuples)
+    workers = min(resolve_jobs(jobs), len(arg_tuples))
+    if workers <= 1:
+        return [_guarded(func, args) for args in arg_tuples]
+    chunksize = max(1, len(arg_tuples) // (workers * 4))
+    call = partial(_guarded_worker, func, PROFILER.enabled)
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for result, error, events in executor.map(call, arg_tuples, chunksize=chunksize):
+            PROFILER.events.extend(events)
+            results.append((result, error))
+    return results
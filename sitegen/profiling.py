@@ -0,0 +1,84 @@
+"""
+Build profiling: per-phase and per-file wall/CPU spans, exported as a
+Chrome trace (chrome://tracing, https://ui.perfetto.dev) plus a summary.
+"""
+
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+class Profiler:
+    """Collects timing spans; does nothing until enabled."""
+
+    def __init__(self):
+        self.enabled = False
+        self.events = []
+
+    @contextmanager
+    def span(self, name, cat='phase', **args):
+        """Time the enclosed block as one trace event.
+
+        cat='file' marks the span covering all work for one file (named after
+        the file); phase spans nested inside it show up under it in the trace.
+        """
+        if not self.enabled:
+            yield
+            return
+        wall_start = time.perf_counter_ns()
+        cpu_start = time.process_time_ns()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter_ns() - wall_start
+            cpu = time.process_time_ns() - cpu_start
+            self.events.append({
+                'name': name,
+                'cat': cat,
+                'ph': 'X',
+                'ts': wall_start / 1000,
+                'dur': wall / 1000,
+                'pid': os.getpid(),
+                'tid': threading.get_ident(),
+                'args': dict(args, cpu_ms=round(cpu / 1e6, 3)),
+            })
+
+    def drain(self):
+        """Remove and return the events recorded so far."""
+        events, self.events = self.events, []
+        return events
+
+    def write_trace(self, path):
+        """Write the recorded events as a Chrome trace JSON file."""
+        with open(path, 'w') as f:
+            json.dump({'traceEvents': self.events, 'displayTimeUnit': 'ms'}, f)
+
+    def summary(self, top=10):
+        """Return per-phase totals and the top-N slowest files as text."""
+        phases = defaultdict(lambda: [0.0, 0.0, 0])
+        files = []
+        for event in self.events:
+            wall_ms = event['dur'] / 1000
+            cpu_ms = event['args']['cpu_ms']
+            if event['cat'] == 'file':
+                files.append((wall_ms, cpu_ms, event['name']))
+            else:
+                totals = phases[event['name']]
+                totals[0] += wall_ms
+                totals[1] += cpu_ms
+                totals[2] += 1
+
+        lines = ['⏱️  Phases (wall / cpu, calls):']
+        for name, (wall_ms, cpu_ms, calls) in sorted(phases.items(), key=lambda item: -item[1][0]):
+            lines.append(f'  {name:<24} {wall_ms:>9.2f} ms {cpu_ms:>9.2f} ms {calls:>6}')
+        files.sort(reverse=True)
+        lines.append(f'🐢 Slowest files (top {min(top, len(files))} of {len(files)}):')
+        for rank, (wall_ms, cpu_ms, name) in enumerate(files[:top], 1):
+            lines.append(f'  {rank:>2}. {name:<48} {wall_ms:>9.2f} ms wall {cpu_ms:>9.2f} ms cpu')
+        return '\n'.join(lines)
+
+# Process-wide profiler used by build.py, publish-blog.py and sitegen
+PROFILER = Profiler()
+span = PROFILER.span
@@ -0,0 +1,159 @@
+/* Site search widget: queries the sharded index built by sitegen/search.py.
+   Shards load lazily, one per query term first character. */
+(function () {
+    'use strict';
+
+    var BASE = '/search/';
+    var MAX_RESULTS = 10;
+    var STOPWORDS = ('a an and are as at be but by for from has have in is it its of on or that the ' +
+                     'this to was we were will with you your our not can').split(' ');
+    var index = null;
+    var shards = {};
+
+    function load(name) {
+        return fetch(BASE + name).then(function (response) {
+            if (!response.ok) throw new Error(response.status);
+            return response.json();
+        });
+    }
+
+    function loadIndex() {
+        if (!index) index = load('index.json');
+        return index;
+    }
+
+    function shardKey(term) {
+        return /^[a-z0-9]/.test(term) ? term[0] : '_';
+    }
+
+    function loadShard(meta, key) {
+        if (meta.shards.indexOf(key) === -1) return Promise.resolve({});
+        if (!shards[key]) shards[key] = load('shard-' + key + '.json');
+        return shards[key];
+    }
+
+    function tokenize(text) {
+        return (text.toLowerCase().match(/[\p{L}\p{N}]+/gu) || []).filter(function (term) {
+            return term.length > 1 && STOPWORDS.indexOf(term) === -1;
+        });
+    }
+
+    // Documents matching every term (the last one as a prefix), best first
+    function search(query) {
+        var terms = tokenize(query);
+        if (!terms.length) return Promise.resolve([]);
+        return loadIndex().then(function (meta) {
+            return Promise.all(terms.map(function (term) {
+                return loadShard(meta, shardKey(term));
+            })).then(function (loaded) {
+                var scores = null;
+                terms.forEach(function (term, i) {
+                    var prefix = i === terms.length - 1;
+                    var found = {};
+                    Object.keys(loaded[i]).forEach(function (candidate) {
+                        if (candidate !== term && !(prefix && candidate.lastIndexOf(term, 0) === 0)) return;
+                        var postings = loaded[i][candidate];
+                        for (var j = 0; j < postings.length; j += 2) {
+                            found[postings[j]] = (found[postings[j]] || 0) + postings[j + 1];
+                        }
+                    });
+                    if (scores === null) {
+                        scores = found;
+                    } else {
+                        Object.keys(scores).forEach(function (doc) {
+                            if (found[doc]) scores[doc] += found[doc];
+                            else delete scores[doc];
+                        });
+                    }
+                });
+                return Object.keys(scores).sort(function (a, b) {
+                    return scores[b] - scores[a] || a - b;
+                }).slice(0, MAX_RESULTS).map(function (doc) {
+                    return meta.docs[doc];
+                });
+            });
+        });
+    }
+
+    function mount() {
+        var form = document.createElement('form');
+        form.className = 'site-search';
+        form.setAttribute('role', 'search');
+        form.innerHTML = '<input type="search" placeholder="Search" aria-label="Search the site" autocomplete="off">' +
+                         '<ol class="site-search-results" hidden></ol>';
+        var style = document.createElement('style');
+        style.textContent =
+            '.site-search{position:relative}' +
+            // Blog headers paint text with a transparent fill (gradient text)
+            '.site-search input{font:inherit;font-size:14px;padding:6px 10px;border-radius:6px;' +
+            'border:1px solid var(--border,#334155);background:transparent;color:inherit;width:160px;' +
+            '-webkit-text-fill-color:currentColor}' +
+            '.site-search-results{position:absolute;right:0;top:calc(100% + 8px);z-index:100;width:320px;' +
+            'max-width:calc(100vw - 32px);text-align:left;-webkit-text-fill-color:currentColor;' +
+            'margin:0;padding:8px;list-style:none;border-radius:8px;border:1px solid var(--border,#334155);' +
+            'background:var(--surface,#1e293b)}' +
+            '.site-search-results li{margin:0;padding:6px 8px}' +
+            '.site-search-results a{border:0;-webkit-text-fill-color:currentColor}';
+        document.head.appendChild(style);
+
+        // Not .nav-links: it is hidden on narrow screens
+        var target = document.querySelector('[data-site-search]') ||
+                     document.querySelector('header nav') ||
+                     document.querySelector('header .container') || document.body;
+        target.appendChild(form);
+
+        var input = form.querySelector('input');
+        var results = form.querySelector('ol');
+        var timer = null;
+        var latest = 0;
+
+        function render(docs) {
+            results.innerHTML = '';
+            docs.forEach(function (doc) {
+                var item = document.createElement('li');
+                var link = document.createElement('a');
+                link.href = doc[0];
+                link.textContent = doc[1] || doc[0];
+                item.appendChild(link);
+                results.appendChild(item);
+            });
+            if (!docs.length && input.value.trim()) {
+                var empty = document.createElement('li');
+                empty.textContent = 'No results';
+                results.appendChild(empty);
+            }
+            results.hidden = !input.value.trim();
+        }
+
+        input.addEventListener('focus', loadIndex, { once: true });
+        input.addEventListener('input', function () {
+            clearTimeout(timer);
+            timer = setTimeout(function () {
+                var request = ++latest;
+                search(input.value).then(function (docs) {
+                    if (request === latest) render(docs);
+                }, function () {
+                    form.hidden = true;  // no index published
+                });
+            }, 120);
+        });
+        form.addEventListener('submit', function (event) {
+            event.preventDefault();
+            var first = results.querySelector('a');
+            if (first) window.location.href = first.href;
+        });
+        document.addEventListener('keydown', function (event) {
+            if (event.key === '/' && document.activeElement !== input &&
+                !/^(INPUT|TEXTAREA)$/.test(document.activeElement.tagName)) {
+                event.preventDefault();
+                input.focus();
+            }
+        });
+    }
+
+    if (document.readyState === 'loading') {
+        document.addEventListener('DOMContentLoaded', mount);
+    } else {
+        mount();
+    }
+})();
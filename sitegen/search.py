@@ -0,0 +1,180 @@
+"""
+Client-side full-text search: a sharded inverted index over the generated
+pages, plus the small widget (search.js) that queries it in the browser.
+
+Each page's terms are cached by content hash in docs/.search-cache.json,
+so a build only re-tokenizes pages whose HTML changed; merging the cached
+terms into shards is a cheap in-memory pass.
+"""
+
+import json
+import re
+from collections import Counter
+from html.parser import HTMLParser
+from pathlib import Path
+
+from .assets import fingerprinted_name, write_fingerprinted, write_if_changed
+from .manifest import hash_file, load_manifest, save_manifest
+from .parallel import map_files
+from .profiling import span
+from .stream import feed_file
+
+SEARCH_DIR = 'search'
+CACHE_NAME = '.search-cache.json'
+CACHE_VERSION = 1
+WIDGET_SOURCE = Path(__file__).with_name('search.js')
+WIDGET_NAME = fingerprinted_name('search', '.js', WIDGET_SOURCE.read_bytes())
+
+# Title terms count this many times as often as body terms
+TITLE_WEIGHT = 5
+
+# Markup whose text is site chrome rather than page content
+SKIP_TAGS = frozenset(('script', 'style', 'header', 'nav', 'footer', 'svg', 'template'))
+
+# Letters and digits; the widget splits queries the same way
+_TERM_RE = re.compile(r'[^\W_]+')
+_TAIL_RE = re.compile(r'[^\W_]*\Z')
+
+STOPWORDS = frozenset(
+    'a an and are as at be but by for from has have in is it its of on or that the '
+    'this to was we were will with you your our not can'.split()
+)
+
+def tokenize(text):
+    """Lowercased search terms in text, stopwords and 1-letter terms removed."""
+    return [term for term in _TERM_RE.findall(text.lower())
+            if len(term) > 1 and term not in STOPWORDS]
+
+def shard_key(term):
+    """Shard holding a term: its first character, or '_' outside [a-z0-9]."""
+    first = term[0]
+    return first if first.isascii() and first.isalnum() else '_'
+
+class _TextExtractor(HTMLParser):
+    """Count the terms of a page's visible content text; collect its <title>.
+
+    Text is tokenized as it arrives, so memory stays bounded however large
+    the page. A text node may reach handle_data in pieces when the page is
+    fed in blocks, so the trailing partial term is held back until the
+    next piece, tag or close().
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.title = []
+        self.counts = Counter()
+        self.pending = ''  # unfinished text, at most one partial term
+        self.skip = []  # stack of open skipped tags
+        self.in_title = False
+
+    def flush(self, partial=False):
+        """Count the pending text; with partial=True keep a trailing partial term."""
+        text, self.pending = self.pending, ''
+        if partial:
+            match = _TAIL_RE.search(text)
+            text, self.pending = text[:match.start()], match.group(0)
+        self.counts.update(tokenize(text))
+
+    def handle_starttag(self, tag, attrs):
+        self.flush()
+        if self.skip:
+            # Only same-named tags matter until the skipped element closes
+            if tag == self.skip[-1]:
+                self.skip.append(tag)
+        elif tag == 'title':
+            self.in_title = True
+        elif tag in SKIP_TAGS or any(name == 'data-search-ignore' for name, _ in attrs):
+            self.skip.append(tag)
+
+    def handle_endtag(self, tag):
+        self.flush()
+        if tag == 'title':
+            self.in_title = False
+        elif self.skip and self.skip[-1] == tag:
+            self.skip.pop()
+
+    def handle_comment(self, data):
+        self.flush()
+
+    def handle_data(self, data):
+        if self.in_title:
+            self.title.append(data)
+        elif not self.skip:
+            self.pending += data
+            self.flush(partial=True)
+
+    def close(self):
+        super().close()
+        self.flush()
+
+def page_terms(path):
+    """Tokenize one HTML page; return (title, {term: count})."""
+    with span('tokenize', file=path.name):
+        parser = feed_file(_TextExtractor(), path)
+        title = ' '.join(''.join(parser.title).split())
+        counts = parser.counts
+        for term in tokenize(title):
+            counts[term] += TITLE_WEIGHT
+    return title, dict(counts)
+
+def build_search_index(output_dir, jobs=1):
+    """Build docs/search/ from every HTML page under output_dir.
+
+    Writes index.json (document list and shard names), one shard-<c>.json
+    per term first character, and the widget as search.<hash>.js
+    (WIDGET_NAME, which pages load). Unchanged files are not rewritten.
+    Returns (pages, tokenized, shards written).
+    """
+    search_dir = output_dir / SEARCH_DIR
+    search_dir.mkdir(exist_ok=True)
+    cache_path = output_dir / CACHE_NAME
+    old_cache = load_manifest(cache_path, CACHE_VERSION).get('pages', {})
+
+    pages = sorted(path for path in output_dir.rglob('*.html')
+                   if search_dir not in path.parents)
+    entries = {}
+    stale = []
+    for path in pages:
+        url = '/' + path.relative_to(output_dir).as_posix()
+        content_hash = hash_file(path)
+        cached = old_cache.get(url)
+        if cached and cached.get('hash') == content_hash:
+            entries[url] = cached
+        else:
+            stale.append((url, path, content_hash))
+
+    results = map_files(page_terms, [(path,) for _, path, _ in stale], jobs=jobs)
+    for (url, path, content_hash), (result, error) in zip(stale, results):
+        if error:
+            print(f"✗ Search: could not index {url}: {error}")
+            continue
+        title, terms = result
+        entries[url] = {'hash': content_hash, 'title': title, 'terms': terms}
+
+    with span('search_index'):
+        # Documents are numbered in URL order so ids are stable across builds
+        docs = []
+        shards = {}
+        for url in sorted(entries):
+            entry = entries[url]
+            if not entry['terms']:
+                continue
+            doc_id = len(docs)
+            docs.append([url, entry['title']])
+            for term, count in entry['terms'].items():
+                shards.setdefault(shard_key(term), {}).setdefault(term, []).extend((doc_id, count))
+
+        written = 0
+        for key, postings in shards.items():
+            data = json.dumps(postings, separators=(',', ':'), sort_keys=True, ensure_ascii=False)
+            written += write_if_changed(search_dir / f'shard-{key}.json', data + '\n')
+        for path in search_dir.glob('shard-*.json'):
+            if path.stem[len('shard-'):] not in shards:
+                path.unlink()
+
+        index = {'version': CACHE_VERSION, 'docs': docs, 'shards': sorted(shards)}
+        write_if_changed(search_dir / 'index.json',
+                         json.dumps(index, separators=(',', ':'), ensure_ascii=False) + '\n')
+        write_fingerprinted(output_dir, 'search', '.js', WIDGET_SOURCE.read_bytes())
+        save_manifest(cache_path, {'version': CACHE_VERSION, 'pages': entries})
+    return len(pages), len(stale), written
@@ -0,0 +1,150 @@
+"""
+Development server: serve a directory, watch sources and live-reload browsers.
+"""
+
+import os
+import threading
+import time
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+RELOAD_PATH = '/__livereload'
+
+# Injected before </body> of every HTML response (never written to disk)
+RELOAD_SCRIPT = (
+    f"<script>new EventSource('{RELOAD_PATH}')"
+    ".onmessage = function () { location.reload(); };</script>"
+).encode('utf-8')
+
+class ReloadState:
+    """Build generation counter that SSE clients wait on."""
+
+    def __init__(self):
+        self.generation = 0
+        self.condition = threading.Condition()
+
+    def bump(self):
+        with self.condition:
+            self.generation += 1
+            self.condition.notify_all()
+
+    def wait(self, generation, timeout):
+        """Block until the generation moves past `generation` or timeout."""
+        with self.condition:
+            self.condition.wait_for(lambda: self.generation != generation, timeout)
+            return self.generation
+
+class DevRequestHandler(SimpleHTTPRequestHandler):
+    """Static file handler with live-reload injection and an SSE endpoint."""
+
+    reload_state = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        if self.path == RELOAD_PATH:
+            self.send_events()
+            return
+        path = self.translate_path(self.path)
+        if os.path.isdir(path):
+            path = os.path.join(path, 'index.html')
+        if path.endswith('.html') and os.path.isfile(path):
+            self.send_html(path)
+            return
+        super().do_GET()
+
+    def send_html(self, path):
+        with open(path, 'rb') as f:
+            body = f.read()
+        marker = body.rfind(b'</body>')
+        if marker == -1:
+            body += RELOAD_SCRIPT
+        else:
+            body = body[:marker] + RELOAD_SCRIPT + body[marker:]
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Cache-Control', 'no-store')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_events(self):
+        """Stream a 'reload' event every time the build generation changes."""
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-store')
+        self.end_headers()
+        state = self.reload_state
+        generation = state.generation
+        try:
+            while True:
+                current = state.wait(generation, timeout=15)
+                if current != generation:
+                    generation = current
+                    self.wfile.write(b'data: reload\n\n')
+                else:
+                    self.wfile.write(b': keepalive\n\n')
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+def snapshot(dirs, suffix='.md'):
+    """Map each watched file to its (mtime_ns, size)."""
+    files = {}
+    for directory in dirs:
+        try:
+            entries = os.scandir(directory)
+        except FileNotFoundError:
+            continue
+        with entries:
+            for entry in entries:
+                if entry.name.endswith(suffix) and entry.is_file():
+                    stat = entry.stat()
+                    files[entry.path] = (stat.st_mtime_ns, stat.st_size)
+    return files
+
+def serve(root, watch_dirs, rebuild, port=8000, interval=0.05):
+    """Serve root over HTTP and rebuild on source changes until interrupted.
+
+    watch_dirs are polled every `interval` seconds (stat calls only); for
+    each new or modified file, rebuild(path) is called and returns the
+    output names it wrote. Browsers reload once per batch of changes.
+    """
+    state = ReloadState()
+
+    class Handler(DevRequestHandler):
+        reload_state = state
+
+    handler = partial(Handler, directory=str(root))
+    server = ThreadingHTTPServer(('127.0.0.1', port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    print(f"👀 Watching {', '.join(str(d) for d in watch_dirs)}")
+    print(f"🌐 Serving {root} at http://127.0.0.1:{port}/ (Ctrl+C to stop)")
+
+    seen = snapshot(watch_dirs)
+    try:
+        while True:
+            time.sleep(interval)
+            current = snapshot(watch_dirs)
+            changed = [path for path, stamp in current.items() if seen.get(path) != stamp]
+            seen = current
+            if not changed:
+                continue
+            start = time.perf_counter()
+            rebuilt = []
+            for path in sorted(changed):
+                try:
+                    rebuilt += rebuild(path) or []
+                except Exception as e:
+                    print(f"✗ Failed {os.path.basename(path)}: {e}")
+            if rebuilt:
+                state.bump()
+                elapsed = (time.perf_counter() - start) * 1000
+                print(f"✓ Rebuilt {', '.join(rebuilt)} in {elapsed:.1f} ms")
+    except KeyboardInterrupt:
+        print("\n👋 Stopped")
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,23 @@
+"""
+Incremental reading for very large documents: source lines for streaming
+renders, and fixed-size blocks for parsing generated pages.
+"""
+
+# Characters read per block when feeding a parser from a file
+BLOCK_SIZE = 64 * 1024
+
+def read_lines(f):
+    """Yield a text file's lines without newlines, like f.read().split('\\n')."""
+    line = ''
+    for line in f:
+        yield line[:-1] if line.endswith('\n') else line
+    if not line or line.endswith('\n'):
+        yield ''
+
+def feed_file(parser, path, block_size=BLOCK_SIZE):
+    """Feed an HTMLParser a file in fixed-size blocks, then close it."""
+    with open(path, encoding='utf-8', errors='replace') as f:
+        for block in iter(lambda: f.read(block_size), ''):
+            parser.feed(block)
+    parser.close()
+    return parser
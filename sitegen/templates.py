@@ -0,0 +1,19 @@
+"""
+Page templates: wrap rendered Markdown bodies into complete documents.
+"""
+
+from .markdown import render_markdown
+from .profiling import span
+
+def render_document(markdown_text, template, **context):
+    """Render Markdown and fill it into a page template.
+
+    `template` is either a str.format template with a {body} field or a
+    callable taking the body HTML followed by the context as keywords.
+    """
+    with span('parse_markdown'):
+        body = render_markdown(markdown_text)
+    with span('template'):
+        if callable(template):
+            return template(body, **context)
+        return template.format(body=body, **context)